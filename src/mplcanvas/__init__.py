@@ -4,18 +4,41 @@ mplcanvas: A matplotlib-compatible plotting library using ipycanvas
 
 __version__ = "0.1.0"
 
-# Import key components for direct access
+# Import key components for direct access. The pyplot functions are
+# re-exported eagerly (like matplotlib): importing the ``mplcanvas.figure``
+# submodule binds it as the package's ``figure`` attribute, so the function
+# has to be imported after it.
 from . import pyplot
 from .figure import Figure
-from .axes import Axes
-
-# For matplotlib compatibility
-import matplotlib.rcsetup as _rcsetup
-
-rcParams = _rcsetup.defaultParams.copy()
-
-# Re-export pyplot functions at package level (like matplotlib)
 from .pyplot import (
     subplots,
     figure,
 )
+
+# Other components are imported on first access
+_lazy_attributes = {
+    "Axes": (".axes", "Axes"),
+}
+
+
+def __getattr__(name):
+    if name == "rcParams":
+        # For matplotlib compatibility. Built on first access, as importing
+        # matplotlib.rcsetup loads all of its validators
+        import matplotlib.rcsetup as _rcsetup
+
+        globals()[name] = _rcsetup.defaultParams.copy()
+        return globals()[name]
+    if name not in _lazy_attributes:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    module_name, attr = _lazy_attributes[name]
+    module = importlib.import_module(module_name, __name__)
+    value = module if attr is None else getattr(module, attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_lazy_attributes) + ["rcParams"])
@@ -0,0 +1,169 @@
+# mplcanvas/_kernels.py
+"""
+Fused array kernels for the drawing hot paths.
+
+Numba is used for large arrays when it is installed; otherwise the
+kernels fall back to NumPy ufuncs that write into the caller's buffer
+without temporaries. Numba is only imported, and the kernels compiled, on
+the first call with a large array: importing it takes longer than drawing
+a small plot.
+"""
+
+import numpy as np
+
+# The numba module once imported, False if it is not installed
+numba = None
+# Compiled kernels, by name
+_compiled = {}
+
+
+def _numba_kernel(name):
+    """Return the numba-compiled kernel ``name``, or None without numba"""
+    global numba
+    if numba is None:
+        try:
+            import numba
+        except ImportError:
+            numba = False
+    if numba is False:
+        return None
+    kernel = _compiled.get(name)
+    if kernel is None:
+        function, options = _NUMBA_KERNELS[name]
+        kernel = _compiled[name] = numba.njit(cache=True, **options)(function)
+    return kernel
+
+
+def _data_to_canvas_numpy(x, y, ax, bx, ay, by, out):
+    """Write ``(ax * x + bx, ay * y + by)`` into the (N, 2) array ``out``"""
+    # The arithmetic runs in the input precision; ``out`` may be float32
+    canvas_x, canvas_y = out[:, 0], out[:, 1]
+    np.multiply(x, ax, out=canvas_x)
+    np.add(canvas_x, bx, out=canvas_x)
+    np.multiply(y, ay, out=canvas_y)
+    np.add(canvas_y, by, out=canvas_y)
+
+
+# Below this many points, numba kernels (and importing numba) cost more
+# than the NumPy passes they save
+PARALLEL_MIN_SIZE = 2048
+
+
+def _data_to_canvas_loop(x, y, ax, bx, ay, by, out):
+    """Write ``(ax * x + bx, ay * y + by)`` into the (N, 2) array ``out``"""
+    for i in numba.prange(x.shape[0]):
+        out[i, 0] = ax * x[i] + bx
+        out[i, 1] = ay * y[i] + by
+
+
+def data_to_canvas(x, y, ax, bx, ay, by, out):
+    """Write ``(ax * x + bx, ay * y + by)`` into the (N, 2) array ``out``"""
+    kernel = None
+    if x.shape[0] >= PARALLEL_MIN_SIZE:
+        kernel = _numba_kernel("data_to_canvas")
+    if kernel is None:
+        _data_to_canvas_numpy(x, y, ax, bx, ay, by, out)
+    else:
+        kernel(x, y, ax, bx, ay, by, out)
+
+
+def _minmax_indices_numpy(x, y, n_buckets):
+    """Indices of the min and max ``y`` in each of ``n_buckets`` columns of sorted ``x``"""
+    bucket = ((x - x[0]) * (n_buckets / (x[-1] - x[0]))).astype(np.int64)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(bucket)) + 1))
+    ids = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(x))))
+    lo = np.fmin.reduceat(y, starts)
+    hi = np.fmax.reduceat(y, starts)
+    # First occurrence of the extremum in each bucket
+    imin = np.flatnonzero(y == lo[ids])
+    imin = imin[np.unique(ids[imin], return_index=True)[1]]
+    imax = np.flatnonzero(y == hi[ids])
+    imax = imax[np.unique(ids[imax], return_index=True)[1]]
+    return np.unique(np.concatenate((imin, imax)))
+
+
+def _minmax_indices_loop(x, y, n_buckets):
+    """Indices of the min and max ``y`` in each of ``n_buckets`` columns of sorted ``x``"""
+    n = x.shape[0]
+    out = np.empty(2 * n_buckets + 2, dtype=np.int64)
+    count = 0
+    scale = n_buckets / (x[n - 1] - x[0])
+    i = 0
+    while i < n:
+        bucket = int((x[i] - x[0]) * scale)
+        imin = imax = i
+        j = i + 1
+        while j < n and int((x[j] - x[0]) * scale) == bucket:
+            if y[j] < y[imin]:
+                imin = j
+            elif y[j] > y[imax]:
+                imax = j
+            j += 1
+        out[count] = min(imin, imax)
+        count += 1
+        if imin != imax:
+            out[count] = max(imin, imax)
+            count += 1
+        i = j
+    return out[:count]
+
+
+def minmax_indices(x, y, n_buckets):
+    """Indices of the min and max ``y`` in each of ``n_buckets`` columns of sorted ``x``"""
+    kernel = None
+    if x.shape[0] >= PARALLEL_MIN_SIZE:
+        kernel = _numba_kernel("minmax_indices")
+    if kernel is None:
+        return _minmax_indices_numpy(x, y, n_buckets)
+    return kernel(x, y, n_buckets)
+
+
+def _minmax_xy_numpy(x, y):
+    """Return ``(xmin, xmax, ymin, ymax)`` of the data"""
+    return x.min(), x.max(), y.min(), y.max()
+
+
+# No fastmath: like the NumPy version, any NaN makes its bounds NaN
+def _minmax_xy_loop(x, y):
+    """Return ``(xmin, xmax, ymin, ymax)`` of the data in a single pass"""
+    if x.shape[0] == 0 or y.shape[0] == 0:
+        raise ValueError("minmax_xy of empty data")
+    xmn = xmx = x[0]
+    ymn = ymx = y[0]
+    for i in range(1, x.shape[0]):
+        xi = x[i]
+        if np.isnan(xi):
+            xmn = xmx = xi
+            break
+        if xi < xmn:
+            xmn = xi
+        elif xi > xmx:
+            xmx = xi
+    for i in range(1, y.shape[0]):
+        yi = y[i]
+        if np.isnan(yi):
+            ymn = ymx = yi
+            break
+        if yi < ymn:
+            ymn = yi
+        elif yi > ymx:
+            ymx = yi
+    return xmn, xmx, ymn, ymx
+
+
+def minmax_xy(x, y):
+    """Return ``(xmin, xmax, ymin, ymax)`` of the data"""
+    kernel = None
+    if x.size >= PARALLEL_MIN_SIZE:
+        kernel = _numba_kernel("minmax_xy")
+    if kernel is None:
+        return _minmax_xy_numpy(x, y)
+    return kernel(x, y)
+
+
+# Kernels compiled by _numba_kernel, with their numba.njit options
+_NUMBA_KERNELS = {
+    "data_to_canvas": (_data_to_canvas_loop, {"parallel": True, "fastmath": True}),
+    "minmax_indices": (_minmax_indices_loop, {}),
+    "minmax_xy": (_minmax_xy_loop, {}),
+}
@@ -12,21 +12,27 @@ class Artist(ABC):
         self.zorder = 0
 
     @abstractmethod
-    def draw(self):
-        """Draw this artist to the canvas"""
+    def draw(self, canvas=None):
+        """Draw this artist to the canvas (by default, its axes' canvas)"""
         pass
 
     def set_visible(self, visible: bool):
         """Set visibility of this artist"""
+        if visible == self.visible:
+            return
         self.visible = visible
+        self._changed()
+
+    def _changed(self):
+        """Outdate the axes' cached rendering and request a redraw"""
+        if self.axes is not None:
+            self.axes._invalidate_line_layer()
+            self.axes._invalidate_pick_index()
         if self.figure:
-            self.figure.draw()
+            self.figure.request_draw()
 
     def remove(self):
         """Remove this artist from its axes"""
         if self.axes:
-            if hasattr(self.axes, "lines") and self in self.axes.lines:
-                self.axes.lines.remove(self)
-            if hasattr(self.axes, "collections") and self in self.axes.collections:
-                self.axes.collections.remove(self)
-            self.figure.draw()
+            self.axes._remove_artist(self)
+            self._changed()
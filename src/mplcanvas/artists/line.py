@@ -1,11 +1,18 @@
 # ipycanvas_plotting/artists/line.py
 import numpy as np
+from ipycanvas import Path2D
+from matplotlib.colors import same_color
+
 from .base import Artist
+from .._kernels import minmax_indices
 
 
 class Line2D(Artist):
     """A line plot artist, similar to matplotlib.lines.Line2D"""
 
+    # Most points sent as Path2D text; longer lines use binary stroke_lines
+    path2d_max_points = 20_000
+
     def __init__(
         self,
         x,
@@ -20,8 +27,9 @@ class Line2D(Artist):
     ):
         super().__init__(axes)
 
-        self.x = np.asarray(x)
-        self.y = np.asarray(y)
+        self._points = None
+        self._path2d = None
+        self._set_xy(x, y)
 
         # Style properties
         self.color = color
@@ -31,52 +39,310 @@ class Line2D(Artist):
         self.markersize = markersize
 
         # Picking support
+        self._picker = None
         self.picker = kwargs.get("picker", None)
 
+    def _set_xy(self, x, y):
+        """Store the data and make sure the canvas point buffer fits it"""
+        # Copied, so that the caller editing its arrays in place and passing
+        # them to set_data again is seen as a change
+        self.x = np.array(x, dtype=np.float64)
+        self.y = np.array(y, dtype=np.float64)
+        # (N, 2) canvas-space buffer reused by every draw, reallocated only on
+        # length change. Pixels need no more than float32, which halves the
+        # payload sent to the browser.
+        if self._points is None or len(self._points) != len(self.x):
+            self._points = np.empty((len(self.x), 2), dtype=np.float32)
+        # Sorted x allows slicing to the view and per-column decimation
+        self._x_sorted = bool(np.all(self.x[1:] >= self.x[:-1]))
+        # Data extent, for the cached Path2D (None if it cannot be used)
+        finite = (
+            len(self.x) > 0 and np.isfinite(self.x).all() and np.isfinite(self.y).all()
+        )
+        self._extent = (
+            (self.x.min(), self.x.max(), self.y.min(), self.y.max()) if finite else None
+        )
+        self._path2d_scale = None
+        # Grid over the segments for picking, built on the first pick
+        self._pick_grid = None
+
     def set_data(self, x, y):
         """Update the line data"""
-        self.x = np.asarray(x)
-        self.y = np.asarray(y)
-        if self.figure:
-            self.figure.draw()
+        if self._same_data(x, self.x) and self._same_data(y, self.y):
+            return
+        self._set_xy(x, y)
+        self._changed()
 
     def set_color(self, color):
         """Set line color"""
+        try:
+            unchanged = same_color(color, self.color)
+        except ValueError:
+            # Different numbers of colors
+            unchanged = False
+        if unchanged:
+            return
         self.color = color
-        if self.figure:
-            self.figure.draw()
+        self._changed()
 
-    def draw(self):
-        """Draw the line to canvas"""
+    @property
+    def picker(self):
+        """The pick tolerance (None if the line is not pickable)"""
+        return self._picker
+
+    @picker.setter
+    def picker(self, picker):
+        self._picker = picker
+        if self.axes is not None:
+            self.axes._invalidate_pick_index()
+
+    def set_picker(self, picker):
+        """Set the pick tolerance (None to make the line unpickable)"""
+        self.picker = picker
+
+    @staticmethod
+    def _same_data(new, old):
+        """Whether ``new`` holds the same values as the stored array ``old``"""
+        return new is old or (
+            np.shape(new) == old.shape and np.array_equal(new, old)
+        )
+
+    def draw(self, canvas=None):
+        """Draw the line to canvas (by default, the axes' canvas)"""
         if not self.visible or len(self.x) == 0:
             return
 
-        canvas = self.axes.canvas
-
-        # Transform data to canvas coordinates
-        canvas_x, canvas_y = self.axes.transData.transform(self.x, self.y)
+        if canvas is None:
+            canvas = self.axes.canvas
 
         # Draw line
         if self.linestyle != "None" and self.linestyle != "":
             canvas.stroke_style = self.color
             canvas.line_width = self.linewidth
-
-            # Use numpy array for efficient drawing
-            points = np.column_stack([canvas_x, canvas_y])
-            canvas.stroke_lines(points)
+            if not self._stroke_path2d(canvas):
+                x, y = self._visible_xy()
+                if len(x) > 0:
+                    canvas.stroke_lines(self._to_canvas(x, y))
 
         # Draw markers if specified
         if self.marker is not None:
-            self._draw_markers(canvas_x, canvas_y)
+            x, y = self._visible_xy()
+            if len(x) > 0:
+                points = self._to_canvas(x, y)
+                self._draw_markers(canvas, points[:, 0], points[:, 1])
+
+    def _to_canvas(self, x, y):
+        """Transform data to canvas coordinates, in place in the point buffer"""
+        points = self._points[: len(x)]
+        self.axes.transData.transform(x, y, out=points)
+        return points
+
+    def _stroke_path2d(self, canvas):
+        """
+        Stroke the line from a cached server-side Path2D, if possible.
+
+        The path holds the data scaled to pixels, relative to the lower-left
+        corner of the data, so panning (which only changes the offset) is
+        redrawn with a canvas translation instead of resending every point.
+        Canvas transforms would also scale the line width, so the path is
+        rebuilt rather than rescaled when the zoom changes. Returns False
+        when the path cannot be used: non-finite or unsorted data, too many
+        points left after decimation (as text, they cost more than the
+        binary points), or a view showing only a small part of the line,
+        where culling sends fewer points.
+        """
+        if self._extent is None or not self._x_sorted:
+            return False
+
+        sx, sy = self.axes._ax, self.axes._ay
+        x0, x1, y0, y1 = self._extent
+        if (
+            abs(sx) * (x1 - x0) > 8 * self.axes.width
+            or abs(sy) * (y1 - y0) > 8 * self.axes.height
+        ):
+            return False
+
+        if self._path2d_scale != (sx, sy):
+            x, y = self.x, self.y
+            n_columns = int(abs(sx) * (x1 - x0))
+            if n_columns > 0:
+                x, y = self._decimate(x, y, n_columns)
+            if self._path2d is not None:
+                self._path2d.close()
+                self._path2d = None
+            if len(x) <= self.path2d_max_points:
+                coords = np.column_stack([(x - x0) * sx, (y - y0) * sy]).round(2)
+                self._path2d = Path2D(
+                    "M" + "L".join(f"{cx} {cy}" for cx, cy in coords.tolist())
+                )
+            # A None path remembers that this zoom level needs the fallback
+            self._path2d_scale = (sx, sy)
+        if self._path2d is None:
+            return False
+
+        canvas.save()
+        canvas.translate(sx * x0 + self.axes._bx, sy * y0 + self.axes._by)
+        canvas.stroke(self._path2d)
+        canvas.restore()
+        return True
+
+    def _visible_xy(self):
+        """Return the data that can show up in the axes' current x range.
+
+        For sorted x, points outside the view are dropped (keeping one on
+        each side so the line still reaches the frame), and lines without
+        markers are reduced to the min and max y of every pixel column
+        once there are more than 4 points per column.
+        """
+        x, y = self.x, self.y
+        if not self._x_sorted:
+            return x, y
 
-    def _draw_markers(self, canvas_x, canvas_y):
+        lo, hi = sorted(self.axes.get_xlim())
+        start = max(np.searchsorted(x, lo) - 1, 0)
+        stop = np.searchsorted(x, hi, side="right") + 1
+        x, y = x[start:stop], y[start:stop]
+
+        if self.marker is None:
+            x, y = self._decimate(x, y, int(self.axes.width))
+        return x, y
+
+    @staticmethod
+    def _decimate(x, y, n_columns):
+        """Keep the endpoints and the min/max y of each column of sorted x"""
+        if len(x) < 4 * n_columns or x[-1] <= x[0]:
+            return x, y
+        keep = minmax_indices(x, y, n_columns)
+        keep = np.unique(np.concatenate(([0], keep, [len(x) - 1])))
+        return x[keep], y[keep]
+
+    def contains_point(self, canvas_x, canvas_y):
+        """Whether a canvas point is within the axes' pick tolerance of the line"""
+        if not self.visible or len(self.x) == 0:
+            return False
+        segments = len(self.x) > 1 and self.linestyle not in ("None", "")
+        index = self._pick_candidates(canvas_x, canvas_y, segments)
+        if len(index) == 0:
+            return False
+
+        x, y = self.axes.transData.transform(self.x[index], self.y[index])
+        dx, dy = canvas_x - x, canvas_y - y
+        if segments:
+            # Distance to the closest point of each segment
+            x1, y1 = self.axes.transData.transform(
+                self.x[index + 1], self.y[index + 1]
+            )
+            sx, sy = x1 - x, y1 - y
+            length2 = sx * sx + sy * sy
+            t = (dx * sx + dy * sy) / np.where(length2 > 0, length2, 1)
+            t = np.clip(t, 0, 1)
+            dx, dy = dx - t * sx, dy - t * sy
+        tol = self.axes._pick_tolerance
+        return bool(np.any(dx * dx + dy * dy <= tol * tol))
+
+    def _pick_candidates(self, canvas_x, canvas_y, segments):
+        """
+        Indices of the segments (or points, if ``segments`` is False) that
+        may be within the pick tolerance of a canvas point.
+        """
+        n = len(self.x) - 1 if segments else len(self.x)
+        if n <= _SegmentGrid.min_size:
+            return np.arange(n)
+        if self._pick_grid is None or self._pick_grid[0] != segments:
+            x, y = self.x, self.y
+            if segments:
+                bounds = (
+                    np.minimum(x[:-1], x[1:]),
+                    np.maximum(x[:-1], x[1:]),
+                    np.minimum(y[:-1], y[1:]),
+                    np.maximum(y[:-1], y[1:]),
+                )
+            else:
+                bounds = (x, x, y, y)
+            self._pick_grid = (segments, _SegmentGrid(*bounds))
+
+        data_x, data_y = self.axes.transData.inverse_transform(canvas_x, canvas_y)
+        tol = self.axes._pick_tolerance
+        return self._pick_grid[1].query(
+            data_x, data_y, tol / abs(self.axes._ax), tol / abs(self.axes._ay)
+        )
+
+    def _draw_markers(self, canvas, canvas_x, canvas_y):
         """Draw markers at data points"""
-        canvas = self.axes.canvas
         canvas.fill_style = self.color
 
-        for x, y in zip(canvas_x, canvas_y):
-            if self.marker == "o":
-                canvas.begin_path()
-                canvas.arc(x, y, self.markersize / 2, 0, 2 * np.pi)
-                canvas.fill()
-            # Add more marker types as needed
+        # One batched command for all markers instead of a path per point
+        if self.marker == "o":
+            canvas.fill_circles(canvas_x, canvas_y, self.markersize / 2)
+        elif self.marker == "s":
+            size = self.markersize
+            canvas.fill_rects(canvas_x - size / 2, canvas_y - size / 2, size)
+        # Add more marker types as needed
+
+
+class _SegmentGrid:
+    """
+    Uniform grid over the data-space bounding boxes of the segments (or
+    points) of a line, so that picking only tests those near the pointer.
+
+    Cells are stored in CSR form: the elements overlapping cell ``c`` are
+    ``items[offsets[c]:offsets[c + 1]]``. Elements spanning more than
+    ``max_cells`` cells are kept apart and returned by every query, and
+    elements with non-finite bounds are never returned.
+    """
+
+    # Lines with fewer elements are tested directly
+    min_size = 128
+    max_cells = 16
+
+    def __init__(self, xmin, xmax, ymin, ymax):
+        valid = np.isfinite(xmin) & np.isfinite(xmax)
+        valid &= np.isfinite(ymin) & np.isfinite(ymax)
+        self.n_side = n_side = max(1, min(256, int(np.sqrt(valid.sum()))))
+        if not valid.any():
+            self.origin = self.cell_size = (0.0, 1.0)
+            self.big = self.items = np.array([], dtype=np.int64)
+            self.offsets = np.zeros(n_side * n_side + 1, dtype=np.int64)
+            return
+        self.origin = (xmin[valid].min(), ymin[valid].min())
+        self.cell_size = (
+            ((xmax[valid].max() - self.origin[0]) / n_side) or 1.0,
+            ((ymax[valid].max() - self.origin[1]) / n_side) or 1.0,
+        )
+
+        index = np.flatnonzero(valid)
+        i0, i1 = self._cells(xmin[index], 0), self._cells(xmax[index], 0)
+        j0, j1 = self._cells(ymin[index], 1), self._cells(ymax[index], 1)
+        n_j = j1 - j0 + 1
+        n_cells = (i1 - i0 + 1) * n_j
+        big = n_cells > self.max_cells
+        self.big = index[big]
+
+        # One (cell, element) pair per cell covered by each small element
+        index, i0, j0, n_j, n_cells = (
+            a[~big] for a in (index, i0, j0, n_j, n_cells)
+        )
+        items = np.repeat(index, n_cells)
+        k = np.arange(len(items)) - np.repeat(np.cumsum(n_cells) - n_cells, n_cells)
+        n_j = np.repeat(n_j, n_cells)
+        cells = (np.repeat(i0, n_cells) + k // n_j) * n_side
+        cells += np.repeat(j0, n_cells) + k % n_j
+        order = np.argsort(cells, kind="stable")
+        self.items = items[order]
+        self.offsets = np.searchsorted(cells[order], np.arange(n_side * n_side + 1))
+
+    def _cells(self, values, axis):
+        """Grid row (axis 0) or column (axis 1) of data values, clipped to the grid"""
+        cells = (np.asarray(values) - self.origin[axis]) // self.cell_size[axis]
+        return np.clip(cells, 0, self.n_side - 1).astype(np.int64)
+
+    def query(self, x, y, tol_x, tol_y):
+        """Indices of the elements that may lie within the tolerances of (x, y)"""
+        i0, i1 = self._cells([x - tol_x, x + tol_x], 0)
+        j0, j1 = self._cells([y - tol_y, y + tol_y], 1)
+        parts = [self.big]
+        for i in range(i0, i1 + 1):
+            row = i * self.n_side
+            start, stop = self.offsets[row + j0], self.offsets[row + j1 + 1]
+            parts.append(self.items[start:stop])
+        return np.unique(np.concatenate(parts))
@@ -1,17 +1,36 @@
 # ipycanvas_plotting/axes.py
 import numpy as np
-from typing import List, Tuple, Any
-from matplotlib.figure import Figure as MplFigure
+from typing import Dict, List, Tuple, Any
+from ipycanvas import Canvas, hold_canvas
+from matplotlib.ticker import MaxNLocator, ScalarFormatter
 from .artists.line import Line2D
+from ._kernels import minmax_xy
 
 # from .artists.scatter import PathCollection
 from .transforms.transforms import DataTransform
 from .events.mouse import MouseEventMixin
 
+# Matplotlib tick locator/formatter for tick calculations, shared by all
+# axes: the view interval is set before every use
+_TICK_LOCATOR = MaxNLocator(nbins="auto")
+_TICK_FORMATTER = ScalarFormatter()
+_TICK_FORMATTER.create_dummy_axis()
 
-# class Axes:
 
-#     def __init__(self):
+class _Geometry:
+    """Axes position attribute that refreshes the cached mappings when set"""
+
+    def __set_name__(self, owner, name):
+        self._name = "_" + name
+
+    def __get__(self, axes, owner=None):
+        if axes is None:
+            return self
+        return getattr(axes, self._name)
+
+    def __set__(self, axes, value):
+        setattr(axes, self._name, value)
+        axes._geometry_changed()
 
 
 class Axes(MouseEventMixin):
@@ -20,12 +39,18 @@ class Axes(MouseEventMixin):
     Similar to matplotlib.axes.Axes but optimized for ipycanvas.
     """
 
+    # Position within figure, in canvas pixels
+    x = _Geometry()
+    y = _Geometry()
+    width = _Geometry()
+    height = _Geometry()
+
     def __init__(self, figure, rect: Tuple[int, int, int, int]):
         self.figure = figure
         self.canvas = figure.canvas  # Direct reference for drawing
 
         # Position within figure (x, y, width, height)
-        self.x, self.y, self.width, self.height = rect
+        self._x, self._y, self._width, self._height = rect
 
         # Data limits
         self._xlim = [0, 1]
@@ -33,11 +58,9 @@ class Axes(MouseEventMixin):
         self._autoscale_x = True
         self._autoscale_y = True
 
-        # Create minimal shadow matplotlib axes for tick calculations
-        self._shadow_fig = MplFigure(figsize=(1, 1))
-        self._shadow_ax = self._shadow_fig.add_subplot(111)
-        self._shadow_ax.set_xlim(self._xlim)
-        self._shadow_ax.set_ylim(self._ylim)
+        # Coordinate transformer
+        self.transData = DataTransform(self)
+        self._recompute_affine()
 
         # Spine properties
         self._spines_visible = True
@@ -56,12 +79,15 @@ class Axes(MouseEventMixin):
         self._label_fontsize = 10
         self._label_fontfamily = "sans-serif"
 
-        # Collections of artists
-        self.lines: List[Line2D] = []
-        self.collections: List[Any] = []  # For scatter plots, etc.
+        # Collections of artists. Dicts keep the insertion (drawing) order
+        # like a list, but remove an artist in O(1)
+        self._lines: Dict[Line2D, None] = {}
+        self._collections: Dict[Any, None] = {}  # For scatter plots, etc.
 
-        # Coordinate transformer
-        self.transData = DataTransform(self)
+        # Offscreen layer holding the rendered lines, re-rasterized only
+        # when the lines, limits or axes geometry change
+        self._line_layer = None
+        self._line_layer_key = None
 
         # Styling
         self.facecolor = "white"
@@ -95,52 +121,49 @@ class Axes(MouseEventMixin):
         else:
             raise ValueError("Invalid number of arguments")
 
+        # Auto-scale if needed (before adding the line, so the first line
+        # replaces the default limits instead of extending them)
+        if self._autoscale_x or self._autoscale_y:
+            self._update_datalim(x, y)
+
         # Create Line2D artist
         line = Line2D(x, y, axes=self, **kwargs)
-        self.lines.append(line)
+        self._lines[line] = None
         lines.append(line)
-
-        # Auto-scale if needed
-        if self._autoscale_x or self._autoscale_y:
-            self._update_datalim(x, y)
-            if self._autoscale_x:
-                self._xlim = [np.min(x), np.max(x)]
-            if self._autoscale_y:
-                self._ylim = [np.min(y), np.max(y)]
+        self._invalidate_line_layer()
+        self._invalidate_pick_index()
 
         # Trigger redraw
-        self.figure.draw()
+        self.figure.request_draw()
 
         return lines[0] if len(lines) == 1 else lines
 
     def scatter(self, x, y, s=None, c=None, **kwargs):
         """Create a scatter plot"""
         collection = PathCollection(x, y, s=s, c=c, axes=self, **kwargs)
-        self.collections.append(collection)
+        self._collections[collection] = None
+        self._invalidate_pick_index()
 
         if self._autoscale_x or self._autoscale_y:
             self._update_datalim(x, y)
 
-        self.figure.draw()
+        self.figure.request_draw()
         return collection
 
-    # # Limit methods
-    # # mplcanvas/axes.py
-    # def set_xlim(self, left: float = None, right: float = None):
-    #     """Set x-axis limits"""
-    #     if left is not None:
-    #         self._xlim[0] = left
-    #     if right is not None:
-    #         self._xlim[1] = right
-    #     self._autoscale_x = False
-
-    # def set_ylim(self, bottom: float = None, top: float = None):
-    #     """Set y-axis limits"""
-    #     if bottom is not None:
-    #         self._ylim[0] = bottom
-    #     if top is not None:
-    #         self._ylim[1] = top
-    #     self._autoscale_y = False
+    @property
+    def lines(self) -> List[Line2D]:
+        """The lines of this axes, in drawing order"""
+        return list(self._lines)
+
+    @property
+    def collections(self) -> List[Any]:
+        """The collections of this axes, in drawing order"""
+        return list(self._collections)
+
+    def _remove_artist(self, artist):
+        """Forget ``artist``, whether it is a line or a collection"""
+        self._lines.pop(artist, None)
+        self._collections.pop(artist, None)
 
     def get_xlim(self) -> Tuple[float, float]:
         return tuple(self._xlim)
@@ -151,58 +174,78 @@ class Axes(MouseEventMixin):
     # Internal methods
     def _update_datalim(self, x, y):
         """Update data limits for autoscaling"""
-        if len(self.lines) == 0 and len(self.collections) == 0:
+        xmin, xmax, ymin, ymax = minmax_xy(np.asarray(x), np.asarray(y))
+        if len(self._lines) == 0 and len(self._collections) == 0:
             # First data
-            self._xlim = [np.min(x), np.max(x)]
-            self._ylim = [np.min(y), np.max(y)]
+            self._xlim = [xmin, xmax]
+            self._ylim = [ymin, ymax]
         else:
             if self._autoscale_x:
-                self._xlim[0] = min(self._xlim[0], np.min(x))
-                self._xlim[1] = max(self._xlim[1], np.max(x))
+                self._xlim[0] = min(self._xlim[0], xmin)
+                self._xlim[1] = max(self._xlim[1], xmax)
             if self._autoscale_y:
-                self._ylim[0] = min(self._ylim[0], np.min(y))
-                self._ylim[1] = max(self._ylim[1], np.max(y))
+                self._ylim[0] = min(self._ylim[0], ymin)
+                self._ylim[1] = max(self._ylim[1], ymax)
+        self._recompute_affine()
+
+    def _recompute_affine(self):
+        """
+        Cache the data -> canvas mapping ``canvas = a * data + b`` for both
+        axes. Must be called whenever the limits or the position change.
+        """
+        # Degenerate limits (e.g. a single point) are drawn as a unit range
+        self._ax = self.width / ((self._xlim[1] - self._xlim[0]) or 1)
+        self._bx = self.x - self._xlim[0] * self._ax
+        self._ay = -self.height / ((self._ylim[1] - self._ylim[0]) or 1)  # Flip Y
+        self._by = self.y + self.height - self._ylim[0] * self._ay
+        self.transData._invalidate()
+
+    def _geometry_changed(self):
+        """Refresh the caches derived from the position, after it changed"""
+        self._recompute_affine()
+        self._update_bbox()
 
     def set_xlim(self, left: float = None, right: float = None):
-        """Set x-axis limits and update shadow axes"""
+        """Set x-axis limits"""
+        self._autoscale_x = False
+        xlim = list(self._xlim)
         if left is not None:
-            self._xlim[0] = left
+            xlim[0] = left
         if right is not None:
-            self._xlim[1] = right
-        self._autoscale_x = False
-
-        # Update shadow axes
-        self._shadow_ax.set_xlim(self._xlim)
+            xlim[1] = right
+        if xlim == self._xlim:
+            return
+        self._xlim = xlim
+        self._recompute_affine()
+        self.figure.request_draw()
 
     def set_ylim(self, bottom: float = None, top: float = None):
-        """Set y-axis limits and update shadow axes"""
+        """Set y-axis limits"""
+        self._autoscale_y = False
+        ylim = list(self._ylim)
         if bottom is not None:
-            self._ylim[0] = bottom
+            ylim[0] = bottom
         if top is not None:
-            self._ylim[1] = top
-        self._autoscale_y = False
-
-        # Update shadow axes
-        self._shadow_ax.set_ylim(self._ylim)
+            ylim[1] = top
+        if ylim == self._ylim:
+            return
+        self._ylim = ylim
+        self._recompute_affine()
+        self.figure.request_draw()
 
     def _get_tick_info(self):
-        """Get tick positions and labels from shadow matplotlib axes"""
-        # Force matplotlib to update ticks
-        self._shadow_fig.canvas.draw()
-
+        """Get tick positions and labels from matplotlib locators/formatters"""
         # Get X ticks
-        x_major_locs = self._shadow_ax.xaxis.get_majorticklocs()
-        x_major_labels = [
-            tick.get_text() for tick in self._shadow_ax.xaxis.get_majorticklabels()
-        ]
-        x_minor_locs = self._shadow_ax.xaxis.get_minorticklocs()
+        x_major_locs = _TICK_LOCATOR.tick_values(*self._xlim)
+        _TICK_FORMATTER.axis.set_view_interval(*self._xlim)
+        x_major_labels = _TICK_FORMATTER.format_ticks(x_major_locs)
+        x_minor_locs = np.array([])  # Matplotlib shows no minor ticks by default
 
         # Get Y ticks
-        y_major_locs = self._shadow_ax.yaxis.get_majorticklocs()
-        y_major_labels = [
-            tick.get_text() for tick in self._shadow_ax.yaxis.get_majorticklabels()
-        ]
-        y_minor_locs = self._shadow_ax.yaxis.get_minorticklocs()
+        y_major_locs = _TICK_LOCATOR.tick_values(*self._ylim)
+        _TICK_FORMATTER.axis.set_view_interval(*self._ylim)
+        y_major_labels = _TICK_FORMATTER.format_ticks(y_major_locs)
+        y_minor_locs = np.array([])
 
         return {
             "x_major_locs": x_major_locs,
@@ -215,15 +258,7 @@ class Axes(MouseEventMixin):
 
     def _data_to_canvas(self, x_data, y_data):
         """Convert data coordinates to canvas coordinates"""
-        # Scale to axes coordinate system
-        x_norm = (x_data - self._xlim[0]) / (self._xlim[1] - self._xlim[0])
-        y_norm = (y_data - self._ylim[0]) / (self._ylim[1] - self._ylim[0])
-
-        # Convert to canvas coordinates
-        x_canvas = self.x + x_norm * self.width
-        y_canvas = self.y + (1 - y_norm) * self.height  # Flip Y axis
-
-        return x_canvas, y_canvas
+        return self._ax * x_data + self._bx, self._ay * y_data + self._by
 
     def _draw_spines(self):
         """Draw the axes spines (borders)"""
@@ -250,107 +285,156 @@ class Axes(MouseEventMixin):
         self.canvas.text_align = "center"
         self.canvas.text_baseline = "top"
 
-        # Draw X ticks and labels
-        for i, x_val in enumerate(tick_info["x_major_locs"]):
-            if self._xlim[0] <= x_val <= self._xlim[1]:  # Only draw visible ticks
-                x_canvas, _ = self._data_to_canvas(x_val, 0)
-
-                # Draw major tick line
-                self.canvas.begin_path()
-                self.canvas.move_to(x_canvas, self.y + self.height)
-                self.canvas.line_to(x_canvas, self.y + self.height + self._tick_length)
-                self.canvas.stroke()
-
-                # Draw tick label
-                if self._labels_visible and i < len(tick_info["x_major_labels"]):
-                    label_text = tick_info["x_major_labels"][i]
-                    if label_text.strip():  # Only draw non-empty labels
-                        self.canvas.fill_text(
-                            label_text,
-                            x_canvas,
-                            self.y + self.height + self._tick_length + 2,
-                        )
-
-        # Draw X minor ticks
-        for x_val in tick_info["x_minor_locs"]:
-            if self._xlim[0] <= x_val <= self._xlim[1]:
-                x_canvas, _ = self._data_to_canvas(x_val, 0)
-
-                # Draw minor tick line (shorter)
-                self.canvas.begin_path()
-                self.canvas.move_to(x_canvas, self.y + self.height)
-                self.canvas.line_to(
-                    x_canvas, self.y + self.height + self._tick_length // 2
-                )
-                self.canvas.stroke()
-
-        # Draw Y ticks and labels
+        # Ticks outside the limits are dropped with one mask per axis, and
+        # all tick marks are stroked with a single canvas command at the end
+        segments = []
+        x_axis_y = self.y + self.height
+
+        # X ticks and labels
+        locs, labels = self._visible_ticks(
+            tick_info["x_major_locs"], tick_info["x_major_labels"], self._xlim
+        )
+        x_canvas = self._ax * locs + self._bx
+        segments.append(
+            self._tick_segments(
+                x_canvas, x_axis_y, x_axis_y + self._tick_length, vertical=True
+            )
+        )
+
+        # Draw tick labels (ipycanvas has no batched text command)
+        if self._labels_visible:
+            for label_text, x in zip(labels, x_canvas.tolist()):
+                if label_text.strip():  # Only draw non-empty labels
+                    self.canvas.fill_text(
+                        label_text, x, x_axis_y + self._tick_length + 2
+                    )
+
+        locs, _ = self._visible_ticks(tick_info["x_minor_locs"], [], self._xlim)
+        segments.append(
+            self._tick_segments(
+                self._ax * locs + self._bx,
+                x_axis_y,
+                x_axis_y + self._tick_length // 2,
+                vertical=True,
+            )
+        )
+
+        # Y ticks and labels
         self.canvas.text_align = "right"
         self.canvas.text_baseline = "middle"
 
-        for i, y_val in enumerate(tick_info["y_major_locs"]):
-            if self._ylim[0] <= y_val <= self._ylim[1]:  # Only draw visible ticks
-                _, y_canvas = self._data_to_canvas(0, y_val)
-
-                # Draw major tick line
-                self.canvas.begin_path()
-                self.canvas.move_to(self.x - self._tick_length, y_canvas)
-                self.canvas.line_to(self.x, y_canvas)
-                self.canvas.stroke()
-
-                # Draw tick label
-                if self._labels_visible and i < len(tick_info["y_major_labels"]):
-                    label_text = tick_info["y_major_labels"][i]
-                    if label_text.strip():  # Only draw non-empty labels
-                        self.canvas.fill_text(
-                            label_text, self.x - self._tick_length - 4, y_canvas
-                        )
-
-        # Draw Y minor ticks
-        for y_val in tick_info["y_minor_locs"]:
-            if self._ylim[0] <= y_val <= self._ylim[1]:
-                _, y_canvas = self._data_to_canvas(0, y_val)
-
-                # Draw minor tick line (shorter)
-                self.canvas.begin_path()
-                self.canvas.move_to(self.x - self._tick_length // 2, y_canvas)
-                self.canvas.line_to(self.x, y_canvas)
-                self.canvas.stroke()
+        locs, labels = self._visible_ticks(
+            tick_info["y_major_locs"], tick_info["y_major_labels"], self._ylim
+        )
+        y_canvas = self._ay * locs + self._by
+        segments.append(
+            self._tick_segments(
+                y_canvas, self.x - self._tick_length, self.x, vertical=False
+            )
+        )
+
+        # Draw tick labels
+        if self._labels_visible:
+            for label_text, y in zip(labels, y_canvas.tolist()):
+                if label_text.strip():  # Only draw non-empty labels
+                    self.canvas.fill_text(
+                        label_text, self.x - self._tick_length - 4, y
+                    )
+
+        locs, _ = self._visible_ticks(tick_info["y_minor_locs"], [], self._ylim)
+        segments.append(
+            self._tick_segments(
+                self._ay * locs + self._by,
+                self.x - self._tick_length // 2,
+                self.x,
+                vertical=False,
+            )
+        )
+
+        segments = np.concatenate(segments)
+        if len(segments):
+            self.canvas.stroke_line_segments(segments)
+
+    @staticmethod
+    def _visible_ticks(locs, labels, lim):
+        """Return the tick locations within ``lim``, and their labels"""
+        locs = np.asarray(locs, dtype=float)
+        mask = (locs >= lim[0]) & (locs <= lim[1])
+        # Labels may be missing for some ticks
+        labels = [label for label, m in zip(labels, mask.tolist()) if m]
+        return locs[mask], labels
+
+    @staticmethod
+    def _tick_segments(positions, start, stop, vertical):
+        """
+        Return an (N, 2, 2) array of tick marks at ``positions``, going from
+        ``start`` to ``stop`` along the other coordinate.
+        """
+        segments = np.empty((len(positions), 2, 2), dtype=np.float32)
+        along, across = (0, 1) if vertical else (1, 0)
+        segments[:, :, along] = positions[:, None]
+        segments[:, 0, across] = start
+        segments[:, 1, across] = stop
+        return segments
 
     def draw(self):
         """Render this axes and all its artists"""
-        # from ipycanvas import hold_canvas
-
-        # with hold_canvas(self.canvas):
-        # Draw axes background
-        self.canvas.fill_style = self.facecolor
-        self.canvas.fill_rect(self.x, self.y, self.width, self.height)
-
-        # Set clipping region to axes area
-        self.canvas.save()
-        self.canvas.begin_path()
-        self.canvas.rect(self.x, self.y, self.width, self.height)
-        self.canvas.clip()
-
-        # Draw spines first
-        self._draw_spines()
-
-        # Draw all line artists
-        for line in self.lines:
-            line.draw()
-
-        # Draw all collections (scatter, etc.)
-        for collection in self.collections:
-            collection.draw()
-
-        # Restore canvas state (remove clipping)
-        self.canvas.restore()
-
-        # Draw ticks and labels on top
-        self._draw_ticks_and_labels()
-
-        # # Draw axes frame and ticks
-        # self._draw_frame()
+        # All commands of the frame go out as one batch
+        with hold_canvas(self.canvas):
+            # Draw axes background
+            self.canvas.fill_style = self.facecolor
+            self.canvas.fill_rect(self.x, self.y, self.width, self.height)
+
+            # Set clipping region to axes area
+            self.canvas.save()
+            self.canvas.begin_path()
+            self.canvas.rect(self.x, self.y, self.width, self.height)
+            self.canvas.clip()
+
+            # Draw spines first
+            self._draw_spines()
+
+            # Draw all line artists, from the cached layer
+            self._draw_line_layer()
+
+            # Draw all collections (scatter, etc.)
+            for collection in self._collections:
+                collection.draw()
+
+            # Restore canvas state (remove clipping)
+            self.canvas.restore()
+
+            # Draw ticks and labels on top
+            self._draw_ticks_and_labels()
+
+    def _invalidate_line_layer(self):
+        """Force the lines to be re-rasterized on the next draw"""
+        self._line_layer_key = None
+
+    def _draw_line_layer(self):
+        """Blit the rendered lines, re-rendering them first if outdated"""
+        width, height = int(np.ceil(self.width)), int(np.ceil(self.height))
+        key = (tuple(self._xlim), tuple(self._ylim), self.x, self.y, width, height)
+
+        if self._line_layer is None or (
+            (self._line_layer.width, self._line_layer.height) != (width, height)
+        ):
+            self._line_layer = Canvas(width=width, height=height)
+            self._line_layer_key = None
+
+        if self._line_layer_key != key:
+            layer = self._line_layer
+            with hold_canvas(layer):
+                layer.clear()
+                # Lines draw in figure canvas coordinates
+                layer.save()
+                layer.translate(-self.x, -self.y)
+                for line in self._lines:
+                    line.draw(layer)
+                layer.restore()
+            self._line_layer_key = key
+
+        self.canvas.draw_image(self._line_layer, self.x, self.y)
 
     def _draw_frame(self):
         """Draw the axes frame and ticks"""
@@ -362,27 +446,15 @@ class Axes(MouseEventMixin):
     def set_xlabel(self, label: str):
         """Set X axis label"""
         self._xlabel = label
-        self._shadow_ax.set_xlabel(label)  # Keep shadow in sync
 
     def set_ylabel(self, label: str):
         """Set Y axis label"""
         self._ylabel = label
-        self._shadow_ax.set_ylabel(label)  # Keep shadow in sync
 
     def set_title(self, title: str):
         """Set axes title"""
         self._title = title
-        self._shadow_ax.set_title(title)  # Keep shadow in sync
 
     def grid(self, visible: bool = True, **kwargs):
         """Enable/disable grid"""
         self._grid_visible = visible
-        self._shadow_ax.grid(visible, **kwargs)  # Keep shadow in sync
-
-    # Cleanup method
-    def __del__(self):
-        """Clean up shadow matplotlib figure"""
-        try:
-            plt.close(self._shadow_fig)
-        except:
-            pass
@@ -3,15 +3,15 @@
 Color handling - initially delegate to matplotlib.colors
 """
 
-try:
-    # Import everything from matplotlib.colors
-    from matplotlib.colors import *
+
+def __getattr__(name):
+    # Forward to matplotlib.colors, which is only imported on first use
     from matplotlib import colors as _mpl_colors
 
-    # Re-export the module for full compatibility
-    __all__ = _mpl_colors.__all__
+    return getattr(_mpl_colors, name)
+
+
+def __dir__():
+    from matplotlib import colors as _mpl_colors
 
-except ImportError:
-    # Fallback implementations if matplotlib not available
-    # TODO: Implement basic color handling
-    pass
+    return sorted(set(globals()) | set(dir(_mpl_colors)))
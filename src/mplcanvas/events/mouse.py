@@ -3,25 +3,85 @@
 Mouse event handling for mplcanvas axes
 """
 
-from typing import Callable, List, Tuple, Optional
-from dataclasses import dataclass
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Dict, List, Tuple, Optional
+
+from .pick import PickEvent, PickIndex
 
 
-@dataclass
 class MouseEvent:
     """
     Mouse event data structure, similar to matplotlib.backend_bases.MouseEvent
+
+    Unless given, the data coordinates are computed from the canvas ones
+    with the inverse transform of ``inaxes`` the first time they are read.
     """
 
-    name: str  # 'button_press_event', 'button_release_event', 'motion_notify_event'
-    canvas_x: float  # Canvas pixel coordinates
-    canvas_y: float
-    data_x: float  # Data coordinates
-    data_y: float
-    button: Optional[int] = None  # 1=left, 2=middle, 3=right
-    key: Optional[str] = None  # Modifier keys
-    dblclick: bool = False
-    inaxes: Optional["Axes"] = None  # Which axes the event occurred in
+    __slots__ = (
+        "name",
+        "canvas_x",
+        "canvas_y",
+        "button",
+        "key",
+        "dblclick",
+        "inaxes",
+        "_data_xy",
+    )
+
+    def __init__(
+        self,
+        # 'button_press_event', 'button_release_event', 'motion_notify_event'
+        name: str,
+        canvas_x: float,  # Canvas pixel coordinates
+        canvas_y: float,
+        data_x: Optional[float] = None,  # Data coordinates
+        data_y: Optional[float] = None,
+        button: Optional[int] = None,  # 1=left, 2=middle, 3=right
+        key: Optional[str] = None,  # Modifier keys
+        dblclick: bool = False,
+        inaxes: Optional["Axes"] = None,  # Which axes the event occurred in
+    ):
+        self.name = name
+        self.canvas_x = canvas_x
+        self.canvas_y = canvas_y
+        self.button = button
+        self.key = key
+        self.dblclick = dblclick
+        self.inaxes = inaxes
+        self._data_xy = None if data_x is None else (data_x, data_y)
+
+    @property
+    def data_x(self) -> float:
+        return self._get_data_xy()[0]
+
+    @property
+    def data_y(self) -> float:
+        return self._get_data_xy()[1]
+
+    def _get_data_xy(self):
+        if self._data_xy is None:
+            self._data_xy = self.inaxes.transData.inverse_transform(
+                self.canvas_x, self.canvas_y
+            )
+        return self._data_xy
+
+    def __repr__(self):
+        return (
+            f"MouseEvent(name={self.name!r}, canvas_x={self.canvas_x!r}, "
+            f"canvas_y={self.canvas_y!r}, button={self.button!r}, "
+            f"key={self.key!r}, dblclick={self.dblclick!r})"
+        )
+
+
+# Event type -> name of the MouseEventMixin attribute holding its callbacks
+_CALLBACK_LISTS = {
+    "button_press_event": "_mouse_press_callbacks",
+    "button_release_event": "_mouse_release_callbacks",
+    "motion_notify_event": "_mouse_motion_callbacks",
+    "pick_event": "_pick_callbacks",
+}
 
 
 class MouseEventMixin:
@@ -40,15 +100,34 @@ class MouseEventMixin:
         self._mouse_motion_callbacks: List[Callable] = []
         self._pick_callbacks: List[Callable] = []
 
+        # Connection id -> (event type, callback), for mpl_disconnect
+        self._cid_map: Dict[int, Tuple[str, Callable]] = {}
+        self._next_cid = 0
+
         # Mouse state tracking
         self._mouse_pressed = False
         self._last_click_time = 0
         self._last_click_pos = (0, 0)
         self._double_click_threshold = 0.3  # seconds
+        self._double_click_distance = 5  # pixels
+        self._duplicate_threshold = 0.001  # seconds
+        self._last_button_event = None  # (kind, x, y, time)
         self._pick_tolerance = 5  # pixels
 
         # Current mouse position (for cursor display)
         self._current_mouse_pos = None
+        self._update_bbox()
+
+        # Spatial index of the pickable artists, built on the first click
+        self._pick_index = None
+
+        # Events are queued by the canvas callbacks, which return at once,
+        # and dispatched from the event loop. Motion is dispatched at most
+        # every `_move_min_interval` seconds, for the latest position only
+        self._event_queue = deque()  # (kind, x, y)
+        self._drain_scheduled = False
+        self._move_min_interval = 1 / 125
+        self._last_move_time = 0.0
 
     def _setup_mouse_events(self):
         """Setup mouse event handlers on the canvas"""
@@ -59,115 +138,207 @@ class MouseEventMixin:
 
     def _on_canvas_mouse_down(self, x: float, y: float):
         """Handle canvas mouse down events"""
-        import time
+        if not self._is_duplicate_button_event("down", x, y):
+            self._queue_event("down", x, y)
+
+    def _on_canvas_mouse_up(self, x: float, y: float):
+        """Handle canvas mouse up events"""
+        if not self._is_duplicate_button_event("up", x, y):
+            self._queue_event("up", x, y)
+
+    def _on_canvas_mouse_move(self, x: float, y: float):
+        """Handle canvas mouse move events"""
+        # The same position can be reported several times: nothing changed
+        if self._current_mouse_pos == (x, y):
+            return
+        # Always track mouse position for cursor display
+        self._current_mouse_pos = (x, y)
+        # Without subscribers there is nothing to dispatch
+        if self._mouse_motion_callbacks:
+            self._queue_event("move", x, y)
+
+    def _queue_event(self, kind: str, x: float, y: float):
+        """Queue an event for dispatch on the next event-loop iteration"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Without an event loop events cannot be deferred: dispatch now
+            if kind == "move":
+                self._last_move_time = time.monotonic()
+            self._dispatch_event(kind, x, y)
+            return
 
+        queue = self._event_queue
+        if kind == "move" and queue and queue[-1][0] == "move":
+            # Only the latest of consecutive motion events is kept
+            queue[-1] = (kind, x, y)
+        else:
+            queue.append((kind, x, y))
+        if not self._drain_scheduled:
+            self._drain_scheduled = True
+            loop.call_soon(self._drain_events)
+
+    def _drain_events(self):
+        """Dispatch the queued events in order, holding back throttled motion"""
+        self._drain_scheduled = False
+        queue = self._event_queue
+        while queue:
+            kind, x, y = queue[0]
+            if kind == "move":
+                now = time.monotonic()
+                wait = self._move_min_interval - (now - self._last_move_time)
+                if wait > 0:
+                    self._drain_scheduled = True
+                    asyncio.get_running_loop().call_later(wait, self._drain_events)
+                    return
+                self._last_move_time = now
+            queue.popleft()
+            self._dispatch_event(kind, x, y)
+
+    def _dispatch_event(self, kind: str, x: float, y: float):
+        """Run the handler of a queued event"""
+        if kind == "move":
+            self._dispatch_mouse_move(x, y)
+        elif kind == "down":
+            self._dispatch_mouse_down(x, y)
+        else:
+            self._dispatch_mouse_up(x, y)
+
+    def _dispatch_mouse_down(self, x: float, y: float):
+        """Run the press callbacks and picking for a mouse position"""
         # Check if this is in our axes
         if not self._point_in_axes(x, y):
             return
 
-        # Convert to data coordinates
-        data_x, data_y = self.transData.inverse_transform(x, y)
-
         # Check for double click
         current_time = time.time()
-        dblclick = False
-        if (
+        dx = x - self._last_click_pos[0]
+        dy = y - self._last_click_pos[1]
+        dblclick = (
             current_time - self._last_click_time < self._double_click_threshold
-            and abs(x - self._last_click_pos[0]) < 5
-            and abs(y - self._last_click_pos[1]) < 5
-        ):
-            dblclick = True
+            and dx * dx + dy * dy < self._double_click_distance**2
+        )
 
         self._last_click_time = current_time
         self._last_click_pos = (x, y)
         self._mouse_pressed = True
 
+        callbacks = self._mouse_press_callbacks
+        if not callbacks and not self._pick_callbacks:
+            return
+
         # Create mouse event
         event = MouseEvent(
             name="button_press_event",
             canvas_x=x,
             canvas_y=y,
-            data_x=data_x,
-            data_y=data_y,
             button=1,  # Left click for now (ipycanvas doesn't distinguish)
             dblclick=dblclick,
             inaxes=self,
         )
 
         # Call registered callbacks
-        for callback in self._mouse_press_callbacks:
+        for callback in callbacks:
             callback(event)
 
         # Check for picking
         self._check_picking(event)
 
-    def _on_canvas_mouse_up(self, x: float, y: float):
-        """Handle canvas mouse up events"""
+    def _dispatch_mouse_up(self, x: float, y: float):
+        """Run the release callbacks for a mouse position"""
         if not self._point_in_axes(x, y):
             return
 
-        data_x, data_y = self.transData.inverse_transform(x, y)
         self._mouse_pressed = False
 
+        callbacks = self._mouse_release_callbacks
+        if not callbacks:
+            return
+
         event = MouseEvent(
             name="button_release_event",
             canvas_x=x,
             canvas_y=y,
-            data_x=data_x,
-            data_y=data_y,
             button=1,
             inaxes=self,
         )
 
-        for callback in self._mouse_release_callbacks:
+        for callback in callbacks:
             callback(event)
 
-    def _on_canvas_mouse_move(self, x: float, y: float):
-        """Handle canvas mouse move events"""
-        # Always track mouse position for cursor display
-        self._current_mouse_pos = (x, y)
+    def _is_duplicate_button_event(self, kind: str, x: float, y: float) -> bool:
+        """
+        Whether a button event repeats the previous one (same kind and
+        position within `_duplicate_threshold` seconds), and should be ignored
+        """
+        now = time.monotonic()
+        last = self._last_button_event
+        self._last_button_event = (kind, x, y, now)
+        return (
+            last is not None
+            and last[:3] == (kind, x, y)
+            and now - last[3] < self._duplicate_threshold
+        )
 
-        if not self._point_in_axes(x, y):
+    def _dispatch_mouse_move(self, x: float, y: float):
+        """Run the motion callbacks for a mouse position"""
+        callbacks = self._mouse_motion_callbacks
+        if not callbacks or not self._point_in_axes(x, y):
             return
 
-        data_x, data_y = self.transData.inverse_transform(x, y)
-
         event = MouseEvent(
             name="motion_notify_event",
             canvas_x=x,
             canvas_y=y,
-            data_x=data_x,
-            data_y=data_y,
             inaxes=self,
         )
 
-        for callback in self._mouse_motion_callbacks:
+        for callback in callbacks:
             callback(event)
 
+    def _update_bbox(self):
+        """Cache the (x0, y0, x1, y1) canvas bounding box of the axes"""
+        self._bbox = (self.x, self.y, self.x + self.width, self.y + self.height)
+
+    def _invalidate_pick_index(self):
+        """Rebuild the picking index on the next click, after artists changed"""
+        self._pick_index = None
+
     def _point_in_axes(self, canvas_x: float, canvas_y: float) -> bool:
         """Check if a canvas point is within this axes"""
-        return (
-            self.x <= canvas_x <= self.x + self.width
-            and self.y <= canvas_y <= self.y + self.height
-        )
+        x0, y0, x1, y1 = self._bbox
+        return x0 <= canvas_x <= x1 and y0 <= canvas_y <= y1
 
     def _check_picking(self, event: MouseEvent):
         """Check if any artists can be picked at this location"""
-        from .pick import PickEvent
-
-        picked_artists = []
-
-        # Check lines
-        for line in self.lines:
-            if hasattr(line, "picker") and line.picker is not None:
-                if line.contains_point(event.canvas_x, event.canvas_y):
-                    picked_artists.append(line)
+        # Nothing to do without listeners or pickable artists
+        if not self._pick_callbacks:
+            return
+        if self._pick_index is None:
+            # Lines first, then collections (scatter plots, etc.)
+            self._pick_index = PickIndex(
+                [
+                    artist
+                    for artist in self.lines + getattr(self, "collections", [])
+                    if getattr(artist, "picker", None) is not None
+                ]
+            )
+        if not self._pick_index.artists:
+            return
 
-        # Check collections (scatter plots, etc.)
-        for collection in getattr(self, "collections", []):
-            if hasattr(collection, "picker") and collection.picker is not None:
-                if collection.contains_point(event.canvas_x, event.canvas_y):
-                    picked_artists.append(collection)
+        # The index finds the artists whose data extent, grown by the pick
+        # tolerance, holds the click; the exact test only runs on those
+        candidates = self._pick_index.query(
+            event.data_x,
+            event.data_y,
+            self._pick_tolerance / abs(self._ax),
+            self._pick_tolerance / abs(self._ay),
+        )
+        picked_artists = [
+            artist
+            for artist in candidates
+            if artist.contains_point(event.canvas_x, event.canvas_y)
+        ]
 
         # Fire pick events
         for artist in picked_artists:
@@ -192,25 +363,24 @@ class MouseEventMixin:
         --------
         int : Connection id (for disconnecting later)
         """
-        if event_type == "button_press_event":
-            self._mouse_press_callbacks.append(callback)
-            return len(self._mouse_press_callbacks) - 1
-        elif event_type == "button_release_event":
-            self._mouse_release_callbacks.append(callback)
-            return len(self._mouse_release_callbacks) - 1
-        elif event_type == "motion_notify_event":
-            self._mouse_motion_callbacks.append(callback)
-            return len(self._mouse_motion_callbacks) - 1
-        elif event_type == "pick_event":
-            self._pick_callbacks.append(callback)
-            return len(self._pick_callbacks) - 1
-        else:
+        if event_type not in _CALLBACK_LISTS:
             raise ValueError(f"Unknown event type: {event_type}")
+        getattr(self, _CALLBACK_LISTS[event_type]).append(callback)
+        self._next_cid += 1
+        self._cid_map[self._next_cid] = (event_type, callback)
+        return self._next_cid
 
     def mpl_disconnect(self, cid: int):
-        """Disconnect a callback (simplified implementation)"""
-        # TODO: Implement proper connection tracking
-        pass
+        """Disconnect the callback with connection id ``cid``, if connected"""
+        if cid not in self._cid_map:
+            return
+        event_type, callback = self._cid_map.pop(cid)
+        # Replace the list rather than mutating it, in case it is being
+        # iterated by a dispatch (a callback disconnecting itself)
+        name = _CALLBACK_LISTS[event_type]
+        callbacks = list(getattr(self, name))
+        callbacks.remove(callback)
+        setattr(self, name, callbacks)
 
     # Convenience methods
     def add_mouse_callback(self, callback: Callable):
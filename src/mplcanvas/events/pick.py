@@ -3,12 +3,20 @@
 Artist picking events
 """
 
+from __future__ import annotations
+
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import Any
-from .mouse import MouseEvent
+from typing import TYPE_CHECKING, Any, List
+
+import numpy as np
 
+if TYPE_CHECKING:
+    # Only needed for annotations: mouse.py imports this module at load time
+    from .mouse import MouseEvent
 
-@dataclass
+
+@dataclass(slots=True)
 class PickEvent:
     """
     Pick event data structure, similar to matplotlib.backend_bases.PickEvent
@@ -17,3 +25,78 @@ class PickEvent:
     name: str  # 'pick_event'
     artist: Any  # The picked artist
     mouseevent: MouseEvent  # The mouse event that triggered the pick
+
+
+class PickIndex:
+    """
+    Uniform grid over the data extents of artists, to find the artists that
+    may contain a point without testing every one of them.
+
+    Artists without a finite ``_extent`` are candidates for every query.
+    """
+
+    def __init__(self, artists: List[Any], n_cells: int = 16):
+        self.artists = artists
+        self._n_cells = n_cells
+        unbounded = (-np.inf, np.inf, -np.inf, np.inf)
+        self._extents = np.array(
+            [getattr(artist, "_extent", None) or unbounded for artist in artists],
+            dtype=float,
+        ).reshape(-1, 4)
+        finite = np.isfinite(self._extents).all(axis=1)
+        self._unbounded = np.flatnonzero(~finite).tolist()
+
+        # Grid cell (i, j) -> indices of the artists overlapping it
+        self._cells = defaultdict(list)
+        self._origin = self._cell_size = None
+        if not finite.any():
+            return
+        bounded = self._extents[finite]
+        x0, y0 = bounded[:, 0].min(), bounded[:, 2].min()
+        width = bounded[:, 1].max() - x0
+        height = bounded[:, 3].max() - y0
+        self._origin = (x0, y0)
+        self._cell_size = ((width or 1) / n_cells, (height or 1) / n_cells)
+        for k in np.flatnonzero(finite).tolist():
+            xmin, xmax, ymin, ymax = self._extents[k]
+            (i0, i1), (j0, j1) = self._cell_range(xmin, xmax, ymin, ymax)
+            for i in range(i0, i1 + 1):
+                for j in range(j0, j1 + 1):
+                    self._cells[i, j].append(k)
+
+    def _cell_range(self, xmin, xmax, ymin, ymax):
+        """Return the ((i0, i1), (j0, j1)) cells covering a box, clipped to the grid"""
+        last = self._n_cells - 1
+        (x0, y0), (dx, dy) = self._origin, self._cell_size
+        i0 = min(max(int((xmin - x0) // dx), 0), last)
+        i1 = min(max(int((xmax - x0) // dx), 0), last)
+        j0 = min(max(int((ymin - y0) // dy), 0), last)
+        j1 = min(max(int((ymax - y0) // dy), 0), last)
+        return (i0, i1), (j0, j1)
+
+    def query(self, x: float, y: float, tol_x: float, tol_y: float) -> List[Any]:
+        """
+        Return the artists whose extent, grown by ``tol_x`` and ``tol_y``,
+        contains the data point ``(x, y)``, in their original order.
+        """
+        candidates = set(self._unbounded)
+        if self._origin is not None:
+            (i0, i1), (j0, j1) = self._cell_range(
+                x - tol_x, x + tol_x, y - tol_y, y + tol_y
+            )
+            for i in range(i0, i1 + 1):
+                for j in range(j0, j1 + 1):
+                    candidates.update(self._cells.get((i, j), ()))
+        if not candidates:
+            return []
+
+        # Cells are coarse (and clipped to the grid): check the extents
+        index = np.array(sorted(candidates))
+        extents = self._extents[index]
+        mask = (
+            (extents[:, 0] - tol_x <= x)
+            & (x <= extents[:, 1] + tol_x)
+            & (extents[:, 2] - tol_y <= y)
+            & (y <= extents[:, 3] + tol_y)
+        )
+        return [self.artists[k] for k in index[mask].tolist()]
@@ -1,11 +1,15 @@
 # mplcanvas/figure.py
-from ipycanvas import hold_canvas, Canvas
+import asyncio
+from contextlib import contextmanager
+
+from ipycanvas import hold_canvas, MultiCanvas
 import ipywidgets as ipw
 
 
 from matplotlib.figure import Figure as MplFigure
 from matplotlib.axes import Axes
 import matplotlib
+import numpy as np
 
 
 matplotlib.use("Agg")  # Headless backend
@@ -39,16 +43,15 @@ class Figure(ipw.HBox):
 
         layout = ipw.Layout(width=f"{self.width}px", height=f"{self.height}px")
 
-        # # Create the canvas
-        # self.multicanvas = MultiCanvas(
-        #     2, width=self.width, height=self.height, layout=layout
-        # )
-        # # self.multicanvas[0].style = {"zIndex": 0}  # Background
-
-        # self.drawing_canvas = self.multicanvas[1]
-        # self.canvas = self.multicanvas[0]
-
-        self.canvas = Canvas(width=self.width, height=self.height, layout=layout)
+        # Create the canvas: the figure is drawn on the bottom layer, and the
+        # top layer holds the tool overlays (zoom rectangle, pan outline), so
+        # these are drawn and cleared without touching the figure pixels. The
+        # top layer also receives the mouse events.
+        self.multicanvas = MultiCanvas(
+            2, width=self.width, height=self.height, layout=layout
+        )
+        self.canvas = self.multicanvas[0]
+        self.overlay = self.multicanvas[1]
 
         # Create toolbar if requested
         self.toolbar = Toolbar(figure=self)
@@ -62,7 +65,7 @@ class Figure(ipw.HBox):
 
         # Initialize as VBox with canvas as child
         super().__init__(
-            children=[self.toolbar, ipw.VBox([self.canvas, self.status_bar])],
+            children=[self.toolbar, ipw.VBox([self.multicanvas, self.status_bar])],
             # children=[ipw.VBox([self.canvas])],
             **kwargs,
         )
@@ -76,6 +79,23 @@ class Figure(ipw.HBox):
         # Auto-draw on creation
         self._auto_draw = True
 
+        # Draw coalescing state (see request_draw / batch)
+        self._dirty = False
+        self._draw_scheduled = False
+        self._batch_depth = 0
+
+        # Canvas region painted by each axes in the last draw, and whether
+        # the next draw has to repaint everything
+        self._painted = {}
+        self._full_redraw = True
+        # Draw function specialized for a figure with a single axes, as
+        # (axes, function); rebuilt by every full redraw
+        self._draw_fast = None
+        # Display-space (x0, y0, x1, y1) box of each axes for hit testing, as
+        # (axes, boxes); rebuilt when the axes change and on full redraws,
+        # which moving or resizing an axes forces
+        self._axes_boxes = None
+
     def add_subplot(self, nrows: int, ncols: int, index: int, **kwargs) -> Axes:
         return self.mpl_figure.add_subplot(nrows, ncols, index, **kwargs)
         # """Add a subplot to the figure"""
@@ -117,15 +137,27 @@ class Figure(ipw.HBox):
         """Return the list of axes in the figure"""
         return self.mpl_figure.axes
 
+    def _same_layout(self, axes, boxes):
+        """Whether the axes and their boxes are those of the cached layout"""
+        return (
+            self._axes_boxes is not None
+            and self._axes_boxes[0] == axes
+            and np.array_equal(self._axes_boxes[1], boxes)
+        )
+
     def _find_axes_at_position(self, xy: tuple[float, float]) -> Axes | None:
         """Find which axes (if any) contains the given canvas coordinates"""
-        for ax in self.axes:
-            if ax.contains_point(xy):
-                # # Convert to axes-relative coordinates
-                # axes_x = x - ax.x
-                # axes_y = y - ax.y
-                return ax  # , axes_x, axes_y
-        # return None, None, None
+        axes = self.mpl_figure.axes
+        if self._axes_boxes is None or self._axes_boxes[0] != axes:
+            boxes = np.array([ax.bbox.extents for ax in axes]).reshape(-1, 4)
+            self._axes_boxes = (axes, boxes)
+        boxes = self._axes_boxes[1]
+        # Test all the boxes at once; the first hit wins, as in figure order
+        x, y = xy
+        hit = (boxes[:, 0] <= x) & (x <= boxes[:, 2])
+        hit &= (boxes[:, 1] <= y) & (y <= boxes[:, 3])
+        index = np.flatnonzero(hit)
+        return axes[index[0]] if len(index) else None
 
     # def _create_toolbar(self, axes=None):
     #     """Create and add the toolbar"""
@@ -165,25 +197,145 @@ class Figure(ipw.HBox):
         """
         # # Ensure we're drawn
         # if self._auto_draw:
-        self.draw()
+        self.draw(full=True)
 
         # Let the parent VBox handle the representation
         return super()._repr_mimebundle_(include=include, exclude=exclude)
 
-    def draw(self):
-        """Render the entire figure"""
-        with hold_canvas(self.canvas):
-            # Clear canvas
-            self.canvas.clear()
+    def request_draw(self, full: bool = False):
+        """
+        Ask for a redraw without drawing right away.
+
+        Requests are coalesced: the figure is marked dirty and a single
+        draw is scheduled on the next event-loop iteration, so several
+        setters called in a row only trigger one redraw. Inside a
+        `batch()` block the draw is deferred to the end of the block.
+        Without a running event loop (plain scripts) this draws
+        immediately. With ``full``, the coming draw repaints the whole
+        figure.
+        """
+        self._dirty = True
+        if full:
+            self._full_redraw = True
+        if self._batch_depth > 0 or self._draw_scheduled:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.draw()
+            return
+        self._draw_scheduled = True
+        loop.call_soon(self._flush_draw)
+
+    def _flush_draw(self):
+        """Run a draw scheduled by request_draw, unless it already happened"""
+        self._draw_scheduled = False
+        if self._dirty and self._batch_depth == 0:
+            self.draw()
+
+    @contextmanager
+    def batch(self):
+        """
+        Group several updates into a single redraw.
+
+        Draw requests made inside the block are held back, and the figure
+        is drawn once on exit if anything asked for a redraw.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._dirty:
+                self.draw()
+
+    def draw(self, full: bool = False):
+        """
+        Render the figure.
 
-            # Draw background
+        Only the axes that changed since the last draw (matplotlib marks
+        them stale) are repainted, each within the region it painted last
+        time. The whole figure is redrawn when ``full`` is True, on the
+        first draw, after background or size changes, and when axes were
+        added or removed.
+        """
+        self._dirty = False
+        axes = self.mpl_figure.axes
+        # Moving or resizing an axes (e.g. set_position) only marks it stale,
+        # but the regions painted last time no longer cover it: redraw all
+        boxes = np.array([ax.bbox.extents for ax in axes]).reshape(-1, 4)
+        full = full or self._full_redraw or not self._same_layout(axes, boxes)
+        if not full and self._draw_fast is not None and axes == [self._draw_fast[0]]:
+            self._draw_fast[1]()
+            return
+        full = full or set(self._painted) != set(axes)
+
+        if full:
+            targets = axes
+        else:
+            targets = [ax for ax in axes if ax.stale]
+            if not targets:
+                return
+            # Clearing a region also erases clean axes that overlap it
+            regions = [self._painted[ax] for ax in targets]
+            grown = True
+            while grown:
+                grown = False
+                for ax in axes:
+                    if ax not in targets and any(
+                        _overlap(self._painted[ax], region) for region in regions
+                    ):
+                        targets.append(ax)
+                        regions.append(self._painted[ax])
+                        grown = True
+            # Keep the figure's stacking order
+            targets = [ax for ax in axes if ax in targets]
+
+        with hold_canvas(self.canvas):
             self.canvas.fill_style = self.facecolor
-            self.canvas.fill_rect(0, 0, self.width, self.height)
+            if full:
+                # Clear canvas and draw background
+                self.canvas.clear()
+                self.canvas.fill_rect(0, 0, self.width, self.height)
+                self._painted.clear()
+                self._axes_boxes = (axes, boxes)
+            else:
+                for ax in targets:
+                    self.canvas.clear_rect(*self._painted[ax])
+                    self.canvas.fill_rect(*self._painted[ax])
+
+            # Draw the axes
+            for ax in targets:
+                self._painted[ax] = draw_axes(ax, self.canvas)
+
+        for ax in targets:
+            ax.stale = False
+        self._full_redraw = False
+        if full:
+            self._draw_fast = (
+                (axes[0], self._make_draw_fast(axes[0])) if len(axes) == 1 else None
+            )
+
+    def _make_draw_fast(self, ax):
+        """
+        Return a draw function for a figure whose only axes is ``ax``, with
+        the canvas, background and painted regions bound as locals: no
+        stale or overlap bookkeeping for other axes is needed.
+        """
+        canvas, facecolor, painted = self.canvas, self.facecolor, self._painted
 
-            # Draw all axes
-            # print("Drawing all axes...", self.mpl_figure.axes)
-            for ax in self.mpl_figure.axes:
-                draw_axes(ax, self.canvas)
+        def draw_fast():
+            if not ax.stale:
+                return
+            region = painted[ax]
+            with hold_canvas(canvas):
+                canvas.fill_style = facecolor
+                canvas.clear_rect(*region)
+                canvas.fill_rect(*region)
+                painted[ax] = draw_axes(ax, canvas)
+            ax.stale = False
+
+        return draw_fast
 
     def show(self):
         """
@@ -195,7 +347,7 @@ class Figure(ipw.HBox):
         """
         # Ensure we're drawn
         if self._auto_draw:
-            self.draw()
+            self.draw(full=True)
 
         # Return self so Jupyter displays it
         return self
@@ -214,7 +366,8 @@ class Figure(ipw.HBox):
 
     def clf(self):
         """Clear the figure"""
-        self.axes.clear()
+        self.mpl_figure.clear()
+        self._full_redraw = True
         self.draw()
 
     # def add_child_widget(self, widget):
@@ -240,8 +393,9 @@ class Figure(ipw.HBox):
     def set_facecolor(self, color):
         """Set the figure face color"""
         self.facecolor = color
+        self._full_redraw = True
         if self._auto_draw:
-            self.draw()
+            self.request_draw()
 
     def set_size_inches(self, w, h=None, forward=True):
         """
@@ -258,9 +412,9 @@ class Figure(ipw.HBox):
             new_width = int(w * self.dpi)
             new_height = int(h * self.dpi)
 
-            # Update canvas size
-            self.canvas.width = new_width
-            self.canvas.height = new_height
+            # Update canvas size (of every layer)
+            self.multicanvas.width = new_width
+            self.multicanvas.height = new_height
             self.width = new_width
             self.height = new_height
 
@@ -277,19 +431,20 @@ class Figure(ipw.HBox):
                 ax.width = self.width - margin_left - margin_right
                 ax.height = self.height - margin_top - margin_bottom
 
+            self._full_redraw = True
             if self._auto_draw:
-                self.draw()
+                self.request_draw()
 
     # Toolbar management methods
     def hide_toolbar(self):
         """Hide the toolbar"""
         if self.toolbar is not None:
-            self.children = [self.canvas]
+            self.children = [self.multicanvas]
 
     def show_toolbar(self):
         """Show the toolbar"""
         if self.toolbar is not None:
-            self.children = [self.toolbar, self.canvas]
+            self.children = [self.toolbar, self.multicanvas]
         elif self._toolbar_enabled and self.axes:
             self._create_toolbar(self.axes[0])
 
@@ -299,3 +454,13 @@ class Figure(ipw.HBox):
             self.hide_toolbar()
         else:
             self.show_toolbar()
+
+
+def _overlap(a, b):
+    """Whether two (x, y, width, height) rectangles intersect"""
+    return (
+        a[0] < b[0] + b[2]
+        and b[0] < a[0] + a[2]
+        and a[1] < b[1] + b[3]
+        and b[1] < a[1] + a[3]
+    )
@@ -1,29 +1,107 @@
+import logging
+import weakref
+
 from matplotlib.colors import to_hex
 import numpy as np
 
 
+from ._kernels import data_to_canvas
 from .utils import flip_y
 
+logger = logging.getLogger(__name__)
 
-def draw_line(line, ax, canvas):
+# (N, 2) canvas-space point buffer of each line, reused by every redraw and
+# reallocated only when the number of points changes
+_point_buffers = weakref.WeakKeyDictionary()
+
+
+def canvas_affine(ax, canvas):
+    """
+    Return ``(sx, ox, sy, oy)`` such that canvas pixels are ``s * data + o``
+    (y flipped), or None if the data transform is not affine (log scales).
+    """
+    trans = ax.transData
+    if not trans.is_affine:
+        return None
+    m = trans.get_matrix()
+    return m[0, 0], m[0, 2], -m[1, 1], flip_y(m[1, 2], canvas)
+
+
+def line_points(line, ax, canvas, affine=None):
+    """
+    Return the (N, 2) canvas coordinates of a line, in its reusable buffer,
+    or None if the line has no data. ``affine`` is the ``canvas_affine`` of
+    the axes, if the caller already has it.
+    """
     # Get data coordinates
     xdata = line.get_xdata()
     ydata = line.get_ydata()
 
     if len(xdata) == 0 or len(ydata) == 0:
-        return
+        return None
+
+    points = _point_buffers.get(line)
+    if points is None or len(points) != len(xdata):
+        points = np.empty((len(xdata), 2), dtype=np.float32)
+        _point_buffers[line] = points
+
+    if affine is None:
+        affine = canvas_affine(ax, canvas)
+    if affine is None:
+        points[:] = ax.transData.transform(np.column_stack([xdata, ydata]))
+        np.subtract(canvas.height, points[:, 1], out=points[:, 1])  # Flip Y
+    else:
+        # One fused pass straight into the buffer sent to the canvas
+        data_to_canvas(
+            np.asarray(xdata, dtype=np.float64),
+            np.asarray(ydata, dtype=np.float64),
+            *affine,
+            points,
+        )
+    return points
 
-    x, y = ax.transData.transform(np.array((xdata, ydata)).T).T
-    y = flip_y(y, canvas)
 
-    canvas.stroke_style = to_hex(line.get_color())
-    canvas.line_width = line.get_linewidth()
-    # Use numpy array for efficient drawing
-    points = np.column_stack([x, y])
-    canvas.stroke_lines(points)
+def draw_line(line, ax, canvas):
+    draw_lines([line], ax, canvas)
+
+
+def draw_lines(lines, ax, canvas):
+    """
+    Draw lines in order. The stroke style is only set when it changes, and
+    consecutive lines with the same style are stroked with one command.
+    """
+    # The transform is the same for all lines of the axes
+    affine = canvas_affine(ax, canvas)
+    run, run_style = [], None
+    for line in lines:
+        points = line_points(line, ax, canvas, affine)
+        if points is None:
+            continue
+        style = (to_hex(line.get_color()), line.get_linewidth())
+        if style != run_style:
+            _stroke_run(run, run_style, canvas)
+            run, run_style = [], style
+        run.append(points)
+    _stroke_run(run, run_style, canvas)
+
+
+def _stroke_run(points, style, canvas):
+    """Stroke a list of polylines sharing the same (color, linewidth)"""
+    if not points:
+        return
+    canvas.stroke_style, canvas.line_width = style
+    if len(points) == 1:
+        canvas.stroke_lines(points[0])
+    else:
+        canvas.stroke_line_segments(points)
 
 
 def draw_ticks_and_labels(ax, canvas):
+    """
+    Draw ticks and labels, and return the (left, top, right, bottom) canvas
+    extent they cover, with a margin. Text widths are estimated from the
+    font size, as the canvas cannot be measured from the kernel.
+    """
     # Draw ticks and labels on all sides
     tick_length = 6
     label_offset = 3
@@ -33,46 +111,80 @@ def draw_ticks_and_labels(ax, canvas):
     canvas.text_align = "center"
     canvas.text_baseline = "top"
 
-    # X axis ticks and labels (bottom)
+    # Ticks outside the limits are dropped with one mask per axis, and all
+    # tick marks are stroked with a single canvas command
     (xmin, xmax), (ymin, ymax) = ax.get_xlim(), ax.get_ylim()
-    xticks = ax.get_xticks()
-    xlabels = [lab.get_text() for lab in ax.get_xticklabels()]
-    for tick, label in zip(xticks, xlabels, strict=True):
-        if tick < xmin or tick > xmax:
-            continue
-        x, y = ax.transData.transform((tick, ymin))
-        y = flip_y(y, canvas)
-        # Tick
-        canvas.begin_path()
-        canvas.move_to(x, y)
-        canvas.line_to(x, y - tick_length)
-        canvas.stroke()
-        # Label
-        canvas.fill_text(label, x, y + tick_length + label_offset)
+    char_width = 0.7 * font_size
+    left, top, right, bottom = np.inf, np.inf, -np.inf, -np.inf
+
+    # X axis ticks and labels (bottom)
+    xticks, xlabels = _visible_ticks(ax.get_xticks(), ax.get_xticklabels(), xmin, xmax)
+    x, y = ax.transData.transform(
+        np.column_stack([xticks, np.full(len(xticks), ymin)])
+    ).T
+    y = flip_y(y, canvas)
+    x_segments = _tick_segments(x, y, x, y - tick_length)
+    for label, lx, ly in zip(xlabels, x.tolist(), y.tolist()):
+        canvas.fill_text(label, lx, ly + tick_length + label_offset)
+    if len(xticks):
+        half_width = np.array([len(label) for label in xlabels]) * char_width / 2
+        left, right = (x - half_width).min(), (x + half_width).max()
+        top = (y - tick_length).min()
+        bottom = (y + tick_length + label_offset + font_size).max()
 
     # Y axis ticks and labels (left)
     canvas.text_align = "right"
     canvas.text_baseline = "middle"
-    yticks = ax.get_yticks()
-    ylabels = [lab.get_text() for lab in ax.get_yticklabels()]
-    # xmin = ax.get_xlim()[0]
-    for tick, label in zip(yticks, ylabels, strict=True):
-        if tick < ymin or tick > ymax:
-            continue
-        x, y = ax.transData.transform((xmin, tick))
-        y = flip_y(y, canvas)
-        # Tick
-        canvas.begin_path()
-        canvas.move_to(x, y)
-        canvas.line_to(x - tick_length, y)
-        canvas.stroke()
-        # Label
-        canvas.fill_text(label, x - tick_length - label_offset, y)
+    yticks, ylabels = _visible_ticks(ax.get_yticks(), ax.get_yticklabels(), ymin, ymax)
+    x, y = ax.transData.transform(
+        np.column_stack([np.full(len(yticks), xmin), yticks])
+    ).T
+    y = flip_y(y, canvas)
+    y_segments = _tick_segments(x, y, x - tick_length, y)
+    for label, lx, ly in zip(ylabels, x.tolist(), y.tolist()):
+        canvas.fill_text(label, lx - tick_length - label_offset, ly)
+    if len(yticks):
+        widths = np.array([len(label) for label in ylabels]) * char_width
+        left = min(left, (x - tick_length - label_offset - widths).min())
+        right = max(right, x.max())
+        top = min(top, (y - font_size / 2).min())
+        bottom = max(bottom, (y + font_size / 2).max())
+
+    segments = np.concatenate([x_segments, y_segments])
+    if len(segments):
+        canvas.stroke_line_segments(segments)
+
+    # The widths are only estimated: the margin keeps wide glyphs inside
+    # the region that partial redraws clear
+    margin = font_size / 2
+    return left - margin, top - margin, right + margin, bottom + margin
+
+
+def _visible_ticks(ticks, labels, vmin, vmax):
+    """Return the tick locations within [vmin, vmax], and their label texts"""
+    ticks = np.asarray(ticks, dtype=float)
+    keep = (ticks >= vmin) & (ticks <= vmax)
+    texts = [
+        label.get_text()
+        for label, visible in zip(labels, keep.tolist(), strict=True)
+        if visible
+    ]
+    return ticks[keep], texts
+
+
+def _tick_segments(x0, y0, x1, y1):
+    """Return the (N, 2, 2) array of the segments from (x0, y0) to (x1, y1)"""
+    segments = np.empty((len(x0), 2, 2))
+    segments[:, 0, 0], segments[:, 0, 1] = x0, y0
+    segments[:, 1, 0], segments[:, 1, 1] = x1, y1
+    return segments
 
 
 def draw_axes(ax, canvas):
-    # Draw frame
-
+    """
+    Draw an axes with its lines, frame, ticks and labels, and return the
+    (x, y, width, height) canvas region that was painted.
+    """
     # Apparently need to ask the axis limits for them to be set correctly
     xmin, xmax = ax.get_xlim()
     ymin, ymax = ax.get_ylim()
@@ -81,40 +193,39 @@ def draw_axes(ax, canvas):
     )
     width = xmax_disp - xmin_disp
     height = ymax_disp - ymin_disp
+    # Display coordinates have y pointing up: the top edge is ymax_disp
+    top_canvas = flip_y(ymax_disp, canvas)
 
-    # (xmin_disp, ymin_disp), (xmax_disp, ymax_disp) = ax.transData.transform(
-    #     ((xmin, ymin), (xmax, ymax))
-    # )
-    # width = xmax_disp - xmin_disp
-    # height = ymax_disp - ymin_disp
-    # print(f"Drawing axes at {xmin_disp},{ymin_disp} size {width}x{height}")
+    logger.debug(
+        "Drawing axes at %s,%s size %sx%s", xmin_disp, ymin_disp, width, height
+    )
 
     # Set clipping region to axes area
     canvas.save()
     canvas.begin_path()
-    canvas.rect(xmin_disp, ymin_disp, width, height)
+    canvas.rect(xmin_disp, top_canvas, width, height)
     canvas.clip()
 
     # Draw all line artists
-    for line in ax.lines:
-        draw_line(line, ax, canvas)
-
-    # # Draw frame
-    # xmin, xmax = ax.get_xlim()
-    # ymin, ymax = ax.get_ylim()
-    (xmin_disp, ymin_disp), (xmax_disp, ymax_disp) = ax.transData.transform(
-        ((xmin, ymin), (xmax, ymax))
-    )
-    width = xmax_disp - xmin_disp
-    height = ymax_disp - ymin_disp
-    # print(f"Drawing axes at {xmin_disp},{ymin_disp} size {width}x{height}")
+    draw_lines(ax.lines, ax, canvas)
 
+    # Draw frame
     canvas.stroke_style = "black"
     canvas.line_width = 1.0
-    canvas.stroke_rect(xmin_disp, ymin_disp, width, height)
+    canvas.stroke_rect(xmin_disp, top_canvas, width, height)
 
     # Restore canvas state (remove clipping)
     canvas.restore()
 
     # Draw ticks and labels
-    draw_ticks_and_labels(ax, canvas)
+    left, top, right, bottom = draw_ticks_and_labels(ax, canvas)
+
+    # Painted region: frame (with its line width) and tick labels, in pixels.
+    # Width and height are negative for inverted axes.
+    frame_x = sorted((xmin_disp, xmin_disp + width))
+    frame_y = sorted((top_canvas, top_canvas + height))
+    left = int(np.floor(min(left, frame_x[0] - 1)))
+    top = int(np.floor(min(top, frame_y[0] - 1)))
+    right = int(np.ceil(max(right, frame_x[1] + 1)))
+    bottom = int(np.ceil(max(bottom, frame_y[1] + 1)))
+    return left, top, right - left, bottom - top
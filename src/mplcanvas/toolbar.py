@@ -3,7 +3,12 @@
 Navigation toolbar for mplcanvas - operates on any axes in the figure
 """
 
+import asyncio
+import time
+import weakref
+
 import ipywidgets as widgets
+import numpy as np
 from ipycanvas import hold_canvas
 
 from .utils import flip_y
@@ -25,18 +30,56 @@ class Toolbar(widgets.VBox):
         self._zoom_rect_start = None
         # self._pan_start_canvas = None
         self._pan_start = None
+        self._last_pan_xy = None  # Pointer position of the last pan step
         self._pan_start_point = None
         self._pan_start_limits = None
         self._active_axes = None  # Which axes is currently being interacted with
+        self._move_active = False  # Whether a pan or zoom drag is in progress
+        # Canvas drag handlers of the active tool, bound when a tool is toggled:
+        # press(ax, x, y), move(ax, x, y) and release(x, y), in display pixels
+        self._press_handler = None
+        self._move_handler = None
+        self._release_handler = None
         self._tools_lock = False
 
         # Store home views for all axes (will be populated as axes are added)
-        self._home_views = {}  # {axes_id: (xlim, ylim)}
+        # Keyed by the axes themselves, so entries go away with the axes
+        self._home_views = weakref.WeakKeyDictionary()  # {axes: limits}
 
         # Zoom rectangle state
         self._zoom_rect_start = None
         self._zoom_rect_current = None
         self._zoom_rect_visible = False
+        # The rectangle preview is capped at a lower rate than mouse moves
+        # (seconds between previews)
+        self._preview_pending = False
+        self._preview_interval = 1 / 30
+
+        # Mouse moves are coalesced: only the latest position is handled, at
+        # most once per display frame
+        self._pending_move = None
+        self._move_scheduled = False
+        self._move_interval = 1 / 60  # seconds
+        self._last_move_flush = 0.0
+
+        # Pan limits are applied at most once per throttle interval (seconds);
+        # the last skipped update is applied at the end of the interval, or
+        # when the pan ends
+        self.pan_zoom_throttle = 0.05
+        self._last_pan_emit = 0.0
+        self._pending_pan_limits = None  # (axes, xlim, ylim)
+        self._pan_flush_scheduled = False
+        # With pan_outline, a pan drag only moves an outline of the axes frame
+        # on the figure overlay, and the limits are applied on release
+        self.pan_outline = False
+        self._pan_frame = None  # (x, y, width, height) of the frame, in pixels
+
+        # Wheel ticks are accumulated into one zoom factor, applied at most
+        # once per interval (seconds) around the last mouse position
+        self._pending_zoom_factor = 1.0
+        self._wheel_zoom_scheduled = False
+        self._wheel_interval = 0.05
+        self._mouse_pos = None
 
         button_layout = widgets.Layout(width="37px", padding="0px 0px 0px 0px")
 
@@ -87,19 +130,34 @@ class Toolbar(widgets.VBox):
     # Button event handlers
     def _on_home_clicked(self, button):
         """Reset all axes to home view"""
+        # Axes already at home are left clean, so they are not redrawn
         for ax in self.figure.axes:
-            ax.autoscale_view()
-
-            # axes_id = id(axes)
-            # if axes_id in self._home_views:
-            #     xlim, ylim = self._home_views[axes_id]
-            #     axes.set_xlim(*xlim)
-            #     axes.set_ylim(*ylim)
+            limits = [*ax.get_xlim(), *ax.get_ylim()]
+            home = self._home_views.get(ax)
+            if home is None:
+                # Never navigated: autoscaling marks the axes stale even when
+                # it leaves the limits as they are
+                stale = ax.stale
+                ax.autoscale_view()
+                if self._same_view([*ax.get_xlim(), *ax.get_ylim()], limits):
+                    ax.stale = stale
+            elif not self._same_view(limits, home):
+                ax.set(xlim=home[:2], ylim=home[2:])
 
         # self.status_label.value = "Reset all axes to home view"
         # self._active_tool = None
         # self._update_button_states()
-        self.figure.draw()
+        self.figure.request_draw()
+
+    @staticmethod
+    def _same_view(limits, other):
+        """
+        Whether two [xmin, xmax, ymin, ymax] views match, up to rounding
+        relative to the span of each axis (views can be of any scale)
+        """
+        limits, other = np.asarray(limits, float), np.asarray(other, float)
+        span = np.repeat(np.abs(other[1::2] - other[::2]), 2)
+        return bool(np.all(np.abs(limits - other) <= 1e-9 * span))
 
     def _on_pan_clicked(self, change):
         """Activate/deactivate pan tool"""
@@ -107,12 +165,12 @@ class Toolbar(widgets.VBox):
             return
         self._tools_lock = True
         if change["new"]:  # Button toggled on
-            self._active_tool = "pan"
+            self._set_active_tool("pan")
             self.zoom_button.value = False  # Deactivate zoom if active
             # self.status_label.value = "Pan tool active - drag on any plot to move it"
         else:  # Button toggled off
             if self._active_tool == "pan":
-                self._active_tool = None
+                self._set_active_tool(None)
                 # self.status_label.value = "Pan tool deactivated"
         # if self._active_tool == "pan":
         #     self._active_tool = None
@@ -129,7 +187,7 @@ class Toolbar(widgets.VBox):
             return
         self._tools_lock = True
         if change["new"]:  # Button toggled on
-            self._active_tool = "zoom"
+            self._set_active_tool("zoom")
             self.pan_button.value = False  # Deactivate pan if active
             self._clear_zoom_rectangle()  # Clear any active rectangle
 
@@ -138,7 +196,7 @@ class Toolbar(widgets.VBox):
             # )
         else:  # Button toggled off
             if self._active_tool == "zoom":
-                self._active_tool = None
+                self._set_active_tool(None)
                 # self.status_label.value = "Zoom tool deactivated"
         self._tools_lock = False
         # if self._active_tool == "zoom":
@@ -151,58 +209,156 @@ class Toolbar(widgets.VBox):
         #     # )
         # self._update_button_states()
 
+    def _set_active_tool(self, tool):
+        """Make ``tool`` ('pan', 'zoom' or None) active and bind its handlers"""
+        if tool == self._active_tool:
+            return
+        self._active_tool = tool
+        self._press_handler, self._move_handler, self._release_handler = {
+            "pan": (self._start_pan, self._do_pan, self._release_pan),
+            "zoom": (self._press_zoom, self._drag_zoom, self._release_zoom),
+        }.get(tool, (None, None, None))
+
     def _store_home_view(self, axes):
         """Store the current view of an axes as its home view"""
-        axes_id = id(axes)
-        self._home_views[axes_id] = (axes.get_xlim(), axes.get_ylim())
+        # One [xmin, xmax, ymin, ymax] array, applied through slice views
+        self._home_views[axes] = np.array([*axes.get_xlim(), *axes.get_ylim()])
 
     def _setup_event_connections(self):
         # """Connect to all existing axes in the figure"""
         # for axes in self.figure.axes:
         #     self.add_axes(axes)
-        self.figure.canvas.on_mouse_down(self._on_canvas_mouse_down)
-        self.figure.canvas.on_mouse_up(self._on_canvas_mouse_up)
-        self.figure.canvas.on_mouse_move(self._on_canvas_mouse_move)
+        # Events are sent by the top (overlay) layer of the multicanvas
+        self.figure.multicanvas.on_mouse_down(self._on_canvas_mouse_down)
+        self.figure.multicanvas.on_mouse_up(self._on_canvas_mouse_up)
+        self.figure.multicanvas.on_mouse_move(self._on_canvas_mouse_move)
+        self.figure.multicanvas.on_mouse_wheel(self._on_canvas_mouse_wheel)
 
     def _on_canvas_mouse_move(self, x: float, y: float):
-        """Handle canvas mouse move events"""
+        """
+        Handle canvas mouse move events, at most once per frame. A move
+        arriving after a quiet frame is handled right away (leading edge);
+        later ones only store the position, and the latest is handled when
+        the frame is over (trailing edge), so a burst of moves costs one pan
+        redraw per frame. Without a running event loop, moves are handled
+        right away.
+        """
+        self._pending_move = self._mouse_pos = (x, y)
+        if self._move_scheduled:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._flush_move()
+            return
+        wait = self._last_move_flush + self._move_interval - time.monotonic()
+        if wait <= 0:
+            self._flush_move()
+            return
+        self._move_scheduled = True
+        loop.call_later(wait, self._flush_move)
+
+    def _flush_move(self):
+        """Handle the latest mouse move, if one is pending"""
+        self._move_scheduled = False
+        if self._pending_move is None:
+            return
+        self._last_move_flush = time.monotonic()
+        x, y = self._pending_move
+        self._pending_move = None
         # Always track mouse position for cursor display
         # self._current_mouse_pos = (x, y)
         y = flip_y(y, self.figure.canvas)
         ax = self.figure._find_axes_at_position((x, y))
-        if ax is None:
-            self.figure.status_bar.value = ""
+        self._update_cursor(ax, x, y)
+        if not self._move_active:
             return
 
-        inv = ax.transData.inverted()
-        data_x, data_y = inv.transform((x, y))
-        self.figure.status_bar.value = f"Mouse at ({data_x:.1f}, {data_y:.1f})"
+        # Keep dragging on the axes the drag started on, wherever the pointer is
+        handler = self._move_handler
+        if handler is not None and self._active_axes is not None:
+            handler(self._active_axes, x, y)
+
+    def _on_canvas_mouse_wheel(self, delta_x: float, delta_y: float):
+        """
+        Zoom the axes under the mouse while the pan or zoom tool is active.
+        Each tick scales the limits by 1.1 (scrolling down zooms out); ticks
+        arriving within the wheel interval are applied together.
+        """
+        # Limits must not change under a pan or zoom drag
+        if self._active_tool is None or self._move_active or not delta_y:
+            return
+        self._pending_zoom_factor *= 1.1 if delta_y > 0 else 1 / 1.1
+        if self._wheel_zoom_scheduled:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._apply_pending_zoom()
+            return
+        self._wheel_zoom_scheduled = True
+        loop.call_later(self._wheel_interval, self._apply_pending_zoom)
+
+    def _apply_pending_zoom(self):
+        """Scale the limits of the axes under the mouse by the pending factor"""
+        self._wheel_zoom_scheduled = False
+        factor, self._pending_zoom_factor = self._pending_zoom_factor, 1.0
+        if factor == 1.0 or self._mouse_pos is None or self._move_active:
+            return
+        x, y = self._mouse_pos
+        y = flip_y(y, self.figure.canvas)
+        ax = self.figure._find_axes_at_position((x, y))
+        if ax is None:
+            return
 
-        if self._active_tool == "pan":
-            # self._do_pan(ax, data_x, data_y)
-            self._do_pan(ax, x, y)
+        if ax not in self._home_views:
+            self._store_home_view(ax)
+        # Scale the corners in pixels about the mouse, so the point under it
+        # stays in place, and the limits stay valid on non-linear scales
+        (xmin, xmax), (ymin, ymax) = ax.get_xlim(), ax.get_ylim()
+        corners = ax.transData.transform(((xmin, ymin), (xmax, ymax)))
+        corners = (x, y) + (corners - (x, y)) * factor
+        xlim, ylim = ax.transData.inverted().transform(corners).T
+        ax.set(xlim=xlim, ylim=ylim)
+        self.figure.request_draw()
+
+    def _update_cursor(self, ax, x: float, y: float):
+        """
+        Show the data position under the mouse in the status bar. This never
+        touches the canvas, and the widget is only synced when the text changes.
+        """
+        if ax is None:
+            text = ""
+        else:
+            data_x, data_y = ax.transData.inverted().transform((x, y))
+            text = f"Mouse at ({data_x:.1f}, {data_y:.1f})"
+        if self.figure.status_bar.value != text:
+            self.figure.status_bar.value = text
 
     def _on_canvas_mouse_down(self, x: float, y: float):
         """Handle mouse press for active tools"""
+        # Presses and releases apply on top of the latest position
+        self._flush_move()
+        handler = self._press_handler
+        if handler is None:
+            return
         y = flip_y(y, self.figure.canvas)
         ax = self.figure._find_axes_at_position((x, y))
         if ax is None:
             return
 
-        if self._active_tool == "pan":
-            # self._active_axes = self._determine_active_axes(event)
-            # if self._active_axes:
-            self._start_pan(ax, x, y)
-        elif self._get_active_tool() == "zoom":
-            # self._active_axes = self._determine_active_axes(event)
-            self._start_zoom(ax, x, y)
-
-        # if not self._point_in_axes(x, y):
-        #     return
+        # The view before the first pan or zoom is what Home goes back to
+        if ax not in self._home_views:
+            self._store_home_view(ax)
+        self._active_axes = ax
+        handler(ax, x, y)
 
     def _on_canvas_mouse_up(self, x: float, y: float):
-        if self._active_tool == "pan" and self._pan_start is not None:
-            self._end_pan()
+        self._flush_move()
+        handler = self._release_handler
+        if handler is not None and self._move_active:
+            handler(x, flip_y(y, self.figure.canvas))
+        self._active_axes = None
 
     # In toolbar _start_pan:
     def _start_pan(self, ax, x, y):
@@ -217,14 +373,27 @@ class Toolbar(widgets.VBox):
         xlim_canvas = (xy_canvas[0][0], xy_canvas[1][0])
         ylim_canvas = (xy_canvas[0][1], xy_canvas[1][1])
 
-        self._pan_start = {
-            "origin": (x, y),
-            "limits": (xlim, ylim),
-            "scale": (
-                (xlim[1] - xlim[0]) / (xlim_canvas[1] - xlim_canvas[0]),
-                (ylim[1] - ylim[0]) / (ylim_canvas[1] - ylim_canvas[0]),
-            ),
-        }
+        # Everything a pan step needs, as flat scalars: the pixel origin, the
+        # data units per pixel, and the starting limits
+        self._pan_start = (
+            x,
+            y,
+            (xlim[1] - xlim[0]) / (xlim_canvas[1] - xlim_canvas[0]),
+            (ylim[1] - ylim[0]) / (ylim_canvas[1] - ylim_canvas[0]),
+            *xlim,
+            *ylim,
+        )
+        self._last_pan_xy = (x, y)
+        self._move_active = True
+
+        if self.pan_outline:
+            x0, y0, x1, y1 = ax.bbox.extents
+            self._pan_frame = (x0, flip_y(y1, self.figure.canvas), x1 - x0, y1 - y0)
+            # Styled once for the whole drag: nothing else draws on the overlay
+            overlay = self.figure.overlay
+            overlay.stroke_style = "black"
+            overlay.line_width = 1
+            overlay.set_line_dash([5, 5])
 
         # self._pan_start_limits = (ax.get_xlim(), ax.get_ylim())
         # print("self._pan_start_point", self._pan_start_point)
@@ -240,35 +409,142 @@ class Toolbar(widgets.VBox):
         ):
             return
 
-        dx = (x - self._pan_start["origin"][0]) * self._pan_start["scale"][0]
-        dy = (y - self._pan_start["origin"][1]) * self._pan_start["scale"][1]
+        # The pointer has not moved since the last step: nothing to update
+        if (x, y) == self._last_pan_xy:
+            return
+        self._last_pan_xy = (x, y)
 
-        # Apply pan using original limits as reference
-        start_xlim, start_ylim = self._pan_start["limits"]
+        x0, y0, kx, ky, xmin, xmax, ymin, ymax = self._pan_start
+        dx = (x - x0) * kx
+        dy = (y - y0) * ky
 
         # print("start point", self._pan_start_point)
         # print("data point", (data_x, data_y))
         # print("delta", (dx, dy))
         # print("start limits", self._pan_start_limits)
 
-        new_xlim = (start_xlim[0] - dx, start_xlim[1] - dx)
-        new_ylim = (start_ylim[0] - dy, start_ylim[1] - dy)
+        # Apply pan using original limits as reference
+        new_xlim = (xmin - dx, xmax - dx)
+        new_ylim = (ymin - dy, ymax - dy)
         # print("new limits", new_xlim, new_ylim)
 
-        # Update limits and redraw
-        ax.set(xlim=new_xlim, ylim=new_ylim)
+        if self.pan_outline:
+            # Canvas y points down, display y up
+            self._pending_pan_limits = (ax, new_xlim, new_ylim)
+            self._draw_pan_outline(x - x0, y0 - y)
+            return
+
+        now = time.monotonic()
+        wait = self._last_pan_emit + self.pan_zoom_throttle - now
+        if wait > 0:
+            self._pending_pan_limits = (ax, new_xlim, new_ylim)
+            if not self._pan_flush_scheduled:
+                try:
+                    loop = asyncio.get_running_loop()
+                except RuntimeError:
+                    return
+                self._pan_flush_scheduled = True
+                loop.call_later(wait, self._flush_pan)
+            return
+        self._last_pan_emit = now
+        self._set_pan_limits(ax, new_xlim, new_ylim)
+
+    def _flush_pan(self):
+        """Apply the pan limits held back by the throttle, if any"""
+        self._pan_flush_scheduled = False
+        if self._pending_pan_limits is None or self._pan_start is None:
+            return
+        self._last_pan_emit = time.monotonic()
+        self._set_pan_limits(*self._pending_pan_limits)
+
+    def _set_pan_limits(self, ax, xlim, ylim):
+        """Update the limits of a panned axes and redraw"""
+        self._pending_pan_limits = None
+        ax.set(xlim=xlim, ylim=ylim)
         # self.figure.mpl_figure.canvas.draw_idle()
         self.figure.draw()
 
+    def _draw_pan_outline(self, dx, dy):
+        """Draw the axes frame moved by (dx, dy) on the overlay"""
+        overlay = self.figure.overlay
+        x, y, width, height = self._pan_frame
+        with hold_canvas(overlay):
+            overlay.clear()
+            overlay.stroke_rect(x + dx, y + dy, width, height)
+
     def _end_pan(self):
         """End panning operation"""
+        if self._pan_frame is not None:
+            self.figure.overlay.clear()
+            if self._pending_pan_limits is not None:
+                self._set_pan_limits(*self._pending_pan_limits)
+            self._pan_frame = None
+        elif self._pending_pan_limits is not None:
+            self._set_pan_limits(*self._pending_pan_limits)
         self._pan_start = None
+        self._move_active = False
         # self._pan_start_limits = None
         # self._active_axes = None
 
-    def _start_zoom(self, ax, x, y):
-        """Start zoom selection on the active axes"""
+    def _release_pan(self, x, y):
+        """End a pan drag on the canvas"""
+        self._end_pan()
+
+    def _press_zoom(self, ax, x, y):
+        """Start a zoom rectangle drag on the canvas"""
         self._zoom_rect_start = (x, y)
+        self._zoom_rect_visible = True
+        self._move_active = True
+        # Styled once for the whole drag: nothing else draws on the overlay
+        self._set_zoom_rect_style(self.figure.overlay)
+
+    def _drag_zoom(self, ax, x, y):
+        """Schedule a preview of the zoom rectangle up to the pointer"""
+        self._zoom_rect_current = (x, y)
+        if self._preview_pending:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._flush_zoom_preview()
+            return
+        self._preview_pending = True
+        loop.call_later(self._preview_interval, self._flush_zoom_preview)
+
+    def _flush_zoom_preview(self):
+        """Draw the latest zoom rectangle over the figure, if still dragging"""
+        self._preview_pending = False
+        if self._zoom_rect_start is None:
+            return
+        overlay = self.figure.overlay
+        x0, y0 = self._zoom_rect_start
+        x, y = self._zoom_rect_current
+        with hold_canvas(overlay):
+            overlay.clear()
+            self._draw_zoom_rectangle(
+                (x0, flip_y(y0, overlay)), (x, flip_y(y, overlay))
+            )
+
+    def _release_zoom(self, x, y):
+        """Zoom the active axes to the dragged rectangle"""
+        ax = self._active_axes
+        x0, y0 = self._zoom_rect_start
+        self._zoom_rect_start = None
+        self._move_active = False
+        self._zoom_rect_visible = False
+        self.figure.overlay.clear()
+
+        # Order the corners in pixels: the limits then keep the axes' direction
+        x0, x1 = (x0, x) if x0 < x else (x, x0)
+        y0, y1 = (y0, y) if y0 < y else (y, y0)
+        # Ignore clicks and slivers
+        if x1 - x0 < 5 or y1 - y0 < 5:
+            return
+        xlim, ylim = ax.transData.inverted().transform(((x0, y0), (x1, y1))).T
+        ax.set(xlim=xlim, ylim=ylim)
+        # Only the zoomed axes is repainted. The draw runs on the next loop
+        # iteration, so rapid zooms share a single draw.
+        self.figure.request_draw()
 
     # def _get_active_tool(self):
     #     """Return the currently active tool"""
@@ -277,38 +553,6 @@ class Toolbar(widgets.VBox):
     #             return name
     #     return None
 
-    # Mouse event handlers
-    def _on_mouse_move(self, event):
-        """Handle mouse movement for active tools"""
-        if self._active_tool == "pan" and self._pan_start_canvas is not None:
-            # Continue pan on the same axes we started on
-            if self._active_axes == event.inaxes:
-                self._do_pan(event)
-        elif self._active_tool == "zoom" and self._zoom_rect_start is not None:
-            # Continue zoom on the same axes we started on
-            if self._active_axes == event.inaxes:
-                self._update_zoom_preview(event)
-
-    def _on_mouse_press(self, event):
-        """Handle mouse press for active tools"""
-        if self._active_tool == "pan":
-            self._active_axes = self._determine_active_axes(event)
-            if self._active_axes:
-                self._start_pan(event)
-        elif self._active_tool == "zoom":
-            self._active_axes = self._determine_active_axes(event)
-            if self._active_axes:
-                self._start_zoom(event)
-
-    def _on_mouse_release(self, event):
-        """Handle mouse release for active tools"""
-        if self._active_tool == "pan" and self._pan_start_canvas is not None:
-            if self._active_axes == self._determine_active_axes(event):
-                self._end_pan()
-        elif self._active_tool == "zoom" and self._zoom_rect_start is not None:
-            if self._active_axes == self._determine_active_axes(event):
-                self._end_zoom(event)
-
     # # Pan implementation (now works on self._active_axes)
     # def _start_pan(self, event):
     #     """Start panning operation on the active axes"""
@@ -487,39 +731,25 @@ class Toolbar(widgets.VBox):
         rect_width = abs(x2 - x1)
         rect_height = abs(y2 - y1)
 
-        # Draw rectangle with dashed border
-        canvas = self.figure.canvas
-        canvas.save()
-
-        # Set rectangle style
-        canvas.stroke_style = "red"
-        canvas.line_width = 1
-        canvas.set_line_dash([5, 5])  # Dashed line
-        canvas.global_alpha = 0.8
-
-        # Draw rectangle border
+        # The style is set once per drag (see _set_zoom_rect_style), so each
+        # frame only sends the two rectangle commands
+        canvas = self.figure.overlay
         canvas.stroke_rect(rect_x, rect_y, rect_width, rect_height)
-
-        # Optional: fill with semi-transparent color
-        canvas.fill_style = "rgba(255, 0, 0, 0.1)"  # Light red
         canvas.fill_rect(rect_x, rect_y, rect_width, rect_height)
 
-        canvas.restore()
+    @staticmethod
+    def _set_zoom_rect_style(canvas):
+        """Set the zoom rectangle style"""
+        canvas.stroke_style = "rgba(255, 0, 0, 0.8)"
+        canvas.line_width = 1
+        canvas.set_line_dash([5, 5])  # Dashed line
+        canvas.fill_style = "rgba(255, 0, 0, 0.08)"  # Light red
 
     def _clear_zoom_rectangle(self):
-        """Clear the zoom rectangle by redrawing the figure"""
+        """Clear the zoom rectangle from the overlay"""
         if self._zoom_rect_visible:
             self._zoom_rect_visible = False
-            # Redraw the entire figure to clear the rectangle
-            self.figure.draw()
-
-    def _start_zoom(self, event):
-        """Start zoom selection on the active axes"""
-        self._zoom_rect_start = (event.data_x, event.data_y)
-        # Store canvas coordinates for rectangle drawing
-        self._zoom_rect_start_canvas = (event.canvas_x, event.canvas_y)
-        self._zoom_rect_visible = True
-        # self.status_label.value = "Selecting zoom region..."
+            self.figure.overlay.clear()
 
     # def _update_zoom_preview(self, event):
     #     """Update zoom rectangle preview"""
@@ -539,60 +769,6 @@ class Toolbar(widgets.VBox):
     #         height = abs(y1 - y0)
     #         # self.status_label.value = f"Zoom region: {width:.2f} × {height:.2f}"
 
-    def _update_zoom_preview(self, event):
-        """Optimized zoom rectangle with minimal redraw"""
-        if self._zoom_rect_start is not None and self._active_axes is not None:
-            # Use the same pattern as pure ipycanvas example
-            with hold_canvas(self.figure.canvas):
-                # Redraw figure content (same as figure.draw() internals)
-                self.figure.canvas.clear()
-                self.figure.canvas.fill_style = self.figure.facecolor
-                self.figure.canvas.fill_rect(
-                    0, 0, self.figure.width, self.figure.height
-                )
-
-                for ax in self.figure.axes:
-                    ax.draw()
-
-                # Add zoom rectangle
-                self._draw_zoom_rectangle(
-                    self._zoom_rect_start_canvas, (event.canvas_x, event.canvas_y)
-                )
-
-    def _end_zoom(self, event):
-        """Complete zoom operation on the active axes"""
-        if self._zoom_rect_start is None or self._active_axes is None:
-            return
-
-        # Clear the rectangle first
-        self._clear_zoom_rectangle()
-
-        x0, y0 = self._zoom_rect_start
-        x1, y1 = event.data_x, event.data_y
-
-        # Ensure we have a proper rectangle (not just a click)
-        min_size = 0.01  # Minimum zoom region size
-        if abs(x1 - x0) < min_size or abs(y1 - y0) < min_size:
-            # self.status_label.value = "Zoom region too small"
-            self._zoom_rect_start = None
-            self._zoom_rect_start_canvas = None
-            self._active_axes = None
-            return
-
-        # Set new limits on the active axes
-        new_xlim = (min(x0, x1), max(x0, x1))
-        new_ylim = (min(y0, y1), max(y0, y1))
-
-        self._active_axes.set_xlim(*new_xlim)
-        self._active_axes.set_ylim(*new_ylim)
-
-        # Clean up
-        self._zoom_rect_start = None
-        self._zoom_rect_start_canvas = None
-        self._active_axes = None
-        # self.status_label.value = "Zoomed"
-        self.figure.draw()  # Final draw to ensure clean state
-
     # # Also update the tool deactivation to clear any active rectangle
     # def _on_zoom_clicked(self, button):
     #     """Activate/deactivate zoom tool"""
@@ -1,43 +1,62 @@
 # ipycanvas_plotting/transforms/transforms.py
 import numpy as np
 
+from .._kernels import PARALLEL_MIN_SIZE, data_to_canvas
+
 
 class DataTransform:
     """Transform between data coordinates and canvas pixels"""
 
     def __init__(self, axes):
         self.axes = axes
+        # Inverse coefficients (sx, ox, sy, oy), data = s * canvas + o
+        self._inv = None
 
-    def transform(self, x, y):
-        """Transform data coordinates to canvas coordinates"""
-        x = np.asarray(x)
-        y = np.asarray(y)
+    def _invalidate(self):
+        """Forget the cached inverse, after the axes' limits changed"""
+        self._inv = None
 
-        # Get data limits
-        xlim = self.axes.get_xlim()
-        ylim = self.axes.get_ylim()
+    def transform(self, x, y, out=None, dtype=None):
+        """Transform data coordinates to canvas coordinates
 
-        # Scale to [0, 1]
-        x_norm = (x - xlim[0]) / (xlim[1] - xlim[0])
-        y_norm = (y - ylim[0]) / (ylim[1] - ylim[0])
-
-        # Scale to canvas coordinates
-        canvas_x = self.axes.x + x_norm * self.axes.width
-        canvas_y = self.axes.y + (1 - y_norm) * self.axes.height  # Flip Y
+        If ``out`` is an (N, 2) array, the canvas coordinates are written
+        into its columns in place and views onto them are returned.
+        Otherwise ``dtype`` (e.g. ``np.float32``, plenty for pixels) sets
+        the precision of the result, float64 by default.
+        """
+        x = np.asarray(x)
+        y = np.asarray(y)
 
+        # Affine coefficients cached by the axes on every limit change
+        ax, bx = self.axes._ax, self.axes._bx
+        ay, by = self.axes._ay, self.axes._by
+
+        if (
+            out is None
+            and x.ndim == 1
+            and x.shape == y.shape
+            and (dtype is not None or x.size >= PARALLEL_MIN_SIZE)
+        ):
+            # Large arrays, or a set dtype, go through the single-pass kernel
+            out = np.empty((x.size, 2), dtype=dtype or np.float64)
+        if out is not None:
+            data_to_canvas(x, y, ax, bx, ay, by, out)
+            return out[:, 0], out[:, 1]
+
+        canvas_x, canvas_y = ax * x + bx, ay * y + by
+        if dtype is not None:
+            return np.asarray(canvas_x, dtype=dtype), np.asarray(canvas_y, dtype=dtype)
         return canvas_x, canvas_y
 
     def inverse_transform(self, canvas_x, canvas_y):
         """Transform canvas coordinates to data coordinates"""
-        # Normalize to [0, 1]
-        x_norm = (canvas_x - self.axes.x) / self.axes.width
-        y_norm = 1 - (canvas_y - self.axes.y) / self.axes.height  # Flip Y
-
-        # Scale to data coordinates
-        xlim = self.axes.get_xlim()
-        ylim = self.axes.get_ylim()
-
-        x = xlim[0] + x_norm * (xlim[1] - xlim[0])
-        y = ylim[0] + y_norm * (ylim[1] - ylim[0])
-
-        return x, y
+        if self._inv is None:
+            axes = self.axes
+            self._inv = (
+                1 / axes._ax,
+                -axes._bx / axes._ax,
+                1 / axes._ay,
+                -axes._by / axes._ay,
+            )
+        sx, ox, sy, oy = self._inv
+        return canvas_x * sx + ox, canvas_y * sy + oy